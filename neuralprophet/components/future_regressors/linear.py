@@ -57,6 +57,30 @@ class LinearFutureRegressors(FutureRegressors):
         out = torch.sum(features.unsqueeze(dim=2) * params.unsqueeze(dim=0).unsqueeze(dim=0), dim=-1)
         return out  # dims (batch, n_forecasts, n_quantiles)
 
+    def regressors_effects(self, inputs, mode, indices=None):
+        """
+        Computes the effect of each regressor of the given mode separately
+
+        Parameters
+        ----------
+            inputs : torch.Tensor, float
+                Regressor features of the given mode, dims (batch, n_forecasts, n_features)
+            mode: string, either "additive" or "multiplicative"
+                mode of the regressors
+            indices : list of int
+                Indices in the feature tensor of the regressors to compute the effects of
+        Returns
+        -------
+            torch.Tensor
+                Effect of each requested regressor, dims (batch, n_forecasts, n_regressors, n_quantiles)
+        """
+        params = self.regressor_params[mode]
+        if indices is not None:
+            inputs = inputs[:, :, indices]
+            params = params[:, indices]
+        # one feature per regressor, the regressor dim precedes the quantiles to keep them contiguous per regressor
+        return torch.einsum("bfn,qn->bfnq", inputs, params)
+
     def get_reg_weights(self, name):
         """
         Retrieve the weights of regressor features given the name
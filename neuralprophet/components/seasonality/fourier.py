@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from collections import OrderedDict
 
 import torch
 import torch.nn as nn
@@ -63,6 +64,25 @@ class FourierSeasonality(Seasonality):
         """
         pass
 
+    def compute_fourier_components(self, s, meta=None):
+        """Compute each seasonality component separately.
+
+        Parameters
+        ----------
+            s : torch.Tensor, float
+                dict of named seasonalities (keys) with their features (values)
+                dims of each dict value (batch, n_forecasts, n_features)
+            meta: dict
+                Metadata about the all the samples of the model input batch. Contains the following:
+                    * ``df_name`` (list, str), time series ID corresponding to each sample of the input batch.
+
+        Returns
+        -------
+            OrderedDict
+                Forecast component of each seasonality, dims (batch, n_forecasts, n_quantiles)
+        """
+        return OrderedDict((name, self.compute_fourier(features, name, meta)) for name, features in s.items())
+
     def forward(self, s, meta):
         """Compute all seasonality components.
 
@@ -110,6 +130,12 @@ class GlobalFourierSeasonality(FourierSeasonality):
             id_list=id_list,
             device=device,
         )
+        if self.season_dims is not None:
+            # Position of the seasonality each of the concatenated fourier terms belongs to, dims (n_fourier_terms)
+            season_of_term = torch.repeat_interleave(
+                torch.arange(len(self.season_dims)), torch.tensor(list(self.season_dims.values()))
+            )
+            self.register_buffer("season_of_term", season_of_term, persistent=False)
 
     def compute_fourier(self, features, name, meta=None):
         """Compute single seasonality component.
@@ -135,6 +161,37 @@ class GlobalFourierSeasonality(FourierSeasonality):
         )
         return seasonality
 
+    def compute_fourier_components(self, s, meta=None):
+        """Compute each seasonality component separately, all at once.
+
+        Parameters
+        ----------
+            s : torch.Tensor, float
+                dict of named seasonalities (keys) with their features (values)
+                dims of each dict value (batch, n_forecasts, n_features)
+            meta: dict
+                Metadata about the all the samples of the model input batch. Contains the following:
+                    * ``df_name`` (list, str), time series ID corresponding to each sample of the input batch.
+
+        Returns
+        -------
+            OrderedDict
+                Forecast component of each seasonality, dims (batch, n_forecasts, n_quantiles)
+        """
+        if list(s.keys()) != list(self.season_dims.keys()):
+            return super().compute_fourier_components(s, meta)
+        # dimensions - batch_size, n_forecasts, fourier terms of all seasonalities
+        features = torch.cat(list(s.values()), dim=-1)
+        # dimensions - quantiles, fourier terms of all seasonalities
+        params = torch.cat([self.season_params[name][:, 0, :] for name in s.keys()], dim=-1)
+        # dimensions - batch_size, n_forecasts, quantiles, fourier terms of all seasonalities
+        terms = features.unsqueeze(dim=2) * params
+        # sum the fourier terms of each seasonality, dimensions - batch_size, n_forecasts, quantiles, seasonalities
+        seasonalities = terms.new_zeros(terms.shape[:-1] + (len(self.season_dims),)).index_add_(
+            -1, self.season_of_term, terms
+        )
+        return OrderedDict((name, seasonalities[..., i]) for i, name in enumerate(s.keys()))
+
 
 class LocalFourierSeasonality(FourierSeasonality):
     def __init__(
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import math
+import sys
 import types
 from dataclasses import dataclass, field
 from typing import Callable, Dict, List, Optional, Type, Union
@@ -9,7 +10,7 @@ from typing import Callable, Dict, List, Optional, Type, Union
 import numpy as np
 import torch
 
-from neuralprophet import configure_components, df_utils
+from neuralprophet import configure_components, df_utils, utils_torch
 from neuralprophet.custom_loss_metrics import PinballLoss
 
 log = logging.getLogger("NP.config")
@@ -147,11 +148,19 @@ class Train:
     n_data: int = field(init=False)
     loss_func_name: str = field(init=False)
     pl_trainer_config: dict = field(default_factory=dict)
+    precision: Optional[Union[int, str]] = None
+    compile_model: bool = False
 
     def __post_init__(self):
         assert self.newer_samples_weight >= 1.0
         assert self.newer_samples_start >= 0.0
         assert self.newer_samples_start < 1.0
+        if self.compile_model and not utils_torch.compile_supported():
+            log.warning(
+                f"torch.compile is not supported by PyTorch {torch.__version__} on Python "
+                f"{sys.version_info.major}.{sys.version_info.minor}. Falling back to the uncompiled model."
+            )
+            self.compile_model = False
         # self.set_loss_func(self.quantiles)
 
         # called in TimeNet configure_optimizers:
@@ -24,11 +24,11 @@ def _normalize(df: pd.DataFrame, config_normalization: Normalization) -> pd.Data
     -------
         df: pd.DataFrame, normalized
     """
-    df_norm = pd.DataFrame()
+    dfs_norm = []
     for df_name, df_i in df.groupby("ID"):
         data_params = config_normalization.get_data_params(df_name)
-        df_i.drop("ID", axis=1, inplace=True)
-        df_aux = df_utils.normalize(df_i, data_params)
+        df_aux = df_utils.normalize(df_i.drop("ID", axis=1), data_params)
         df_aux["ID"] = df_name
-        df_norm = pd.concat((df_norm, df_aux), ignore_index=True)
-    return df_norm
+        dfs_norm.append(df_aux)
+    # concatenate all normalized dataframes at once
+    return pd.concat(dfs_norm, ignore_index=True) if dfs_norm else pd.DataFrame()
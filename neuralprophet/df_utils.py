@@ -166,9 +166,10 @@ def data_params_definition(
     if df["ds"].dtype == np.int64:
         df["ds"] = df.loc[:, "ds"].astype(str)
     df["ds"] = pd.to_datetime(df.loc[:, "ds"])
+    ds_min = df["ds"].min()
     data_params["ds"] = ShiftScale(
-        shift=df["ds"].min(),
-        scale=df["ds"].max() - df["ds"].min(),
+        shift=ds_min,
+        scale=df["ds"].max() - ds_min,
     )
     if "y" in df:
         data_params["y"] = get_normalization_params(
@@ -311,10 +312,11 @@ def init_data_params(
 
 
 def auto_normalization_setting(array):
-    if len(np.unique(array)) < 2:
+    n_unique = len(np.unique(array))
+    if n_unique < 2:
         raise ValueError("Encountered variable with singular value in training set. Please remove variable.")
     # elif set(series.unique()) in ({True, False}, {1, 0}, {1.0, 0.0}, {-1, 1}, {-1.0, 1.0}):
-    elif len(np.unique(array)) == 2:
+    elif n_unique == 2:
         return "minmax"  # Don't standardize binary variables.
     else:
         return "soft"  # default setting
@@ -373,17 +375,26 @@ def normalize(df, data_params):
         pd.DataFrame
             normalized dataframes
     """
-    for name in df.columns:
-        if name == "ID":
-            continue
+    names = [name for name in df.columns if name != "ID"]
+    for name in names:
         if name not in data_params.keys():
             raise ValueError(f"Unexpected column {name} in data")
-        new_name = name
-        if name == "ds":
-            new_name = "t"
-        if name == "y":
-            new_name = "y_scaled"
-        df[new_name] = df[name].sub(data_params[name].shift).div(data_params[name].scale)
+    if "ds" in names:
+        df["t"] = df["ds"].sub(data_params["ds"].shift).div(data_params["ds"].scale)
+    columns = [name for name in names if name != "ds"]
+    # scale the plain float columns of each dtype in one vectorized operation, keeping their dtype
+    float_dtypes = {df[name].dtype for name in columns if df[name].dtype in (np.float32, np.float64)}
+    for dtype in float_dtypes:
+        group = [name for name in columns if df[name].dtype == dtype]
+        shift = np.array([data_params[name].shift for name in group], dtype=dtype)
+        scale = np.array([data_params[name].scale for name in group], dtype=dtype)
+        new_names = ["y_scaled" if name == "y" else name for name in group]
+        df[new_names] = (df[group].to_numpy() - shift) / scale
+    # other columns, e.g. integer or nullable ones, are scaled one at a time with their pandas dtype semantics
+    for name in columns:
+        if df[name].dtype not in float_dtypes:
+            new_name = "y_scaled" if name == "y" else name
+            df[new_name] = df[name].sub(data_params[name].shift).div(data_params[name].scale)
     return df
 
 
@@ -431,7 +442,7 @@ def check_dataframe(
         raise ValueError("Found NaN in column ds.")
     if not np.issubdtype(df["ds"].to_numpy().dtype, np.datetime64):
         df["ds"] = pd.to_datetime(df.loc[:, "ds"], utc=True).dt.tz_convert(None)
-    if df.groupby("ID").apply(lambda x: x.duplicated("ds").any()).any():
+    if df.duplicated(["ID", "ds"]).any():
         raise ValueError("Column ds has duplicate values. Please remove duplicates.")
 
     regressors_to_remove = []
@@ -478,7 +489,7 @@ def check_dataframe(
     for name in columns:
         if name not in df:
             raise ValueError(f"Column {name!r} missing from dataframe")
-        if sum(df.loc[:, name].notnull().values) < 1:
+        if np.count_nonzero(df.loc[:, name].notnull().values) < 1:
             raise ValueError(f"Dataframe column {name!r} only has NaN rows.")
         if not np.issubdtype(df[name].dtype, np.number):
             df[name] = pd.to_numeric(df[name])
@@ -1096,11 +1107,13 @@ def fill_linear_then_rolling_avg(series, limit_linear, rolling):
     # impute small gaps linearly:
     series = pd.to_numeric(series)
     series = series.interpolate(method="linear", limit=limit_linear, limit_direction="both")
-    # fill remaining gaps with rolling avg
-    is_na = pd.isna(series)
-    rolling_avg = series.rolling(rolling + 2 * limit_linear, min_periods=2 * limit_linear, center=True).mean()
-    series.loc[is_na] = rolling_avg[is_na]
-    remaining_na = sum(series.isnull())
+    # fill remaining gaps with rolling avg, only computed if any gaps remain
+    is_na = series.isna().values
+    remaining_na = np.count_nonzero(is_na)
+    if remaining_na > 0:
+        rolling_avg = series.rolling(rolling + 2 * limit_linear, min_periods=2 * limit_linear, center=True).mean()
+        series.loc[is_na] = rolling_avg[is_na]
+        remaining_na = np.count_nonzero(series.isna().values)
     return series, remaining_na
 
 
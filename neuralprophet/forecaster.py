@@ -11,7 +11,6 @@ import pytorch_lightning as pl
 import torch
 from matplotlib import pyplot
 from matplotlib.axes import Axes
-from torch.utils.data import DataLoader
 
 from neuralprophet import (
     configure,
@@ -418,6 +417,19 @@ class NeuralProphet:
             ----
             The forecast/prediction origin set refers to the last observation's timestamp, not the first forecast target.
             In the special case where no auto-regression or lagged regressors are used, the forecast origin and forecast target are identical.
+        precision: int, str
+            Numerical precision used by the Pytorch Lightning Trainer, e.g. ``"bf16-mixed"`` for BF16 mixed precision
+            training on supported GPUs.
+            Provide `None` to use the trainer default (32-bit).
+
+            Note
+            ----
+            If ``precision`` is also set in ``trainer_config``, the value in ``trainer_config`` takes precedence.
+        compile_model: bool
+            Whether to compile the forward pass of the model with ``torch.compile`` (requires PyTorch 2).
+            Compilation takes time on the first batches, but can speed up the training of larger models.
+            Where ``torch.compile`` is not supported (e.g. Python 3.12 with PyTorch < 2.4), a warning is logged and
+            the model runs uncompiled.
     """
 
     model: time_net.TimeNet
@@ -472,6 +484,8 @@ class NeuralProphet:
         accelerator: Optional[str] = None,
         trainer_config: Optional[dict] = None,
         prediction_frequency: Optional[dict] = None,
+        precision: Optional[Union[int, str]] = None,
+        compile_model: bool = False,
     ):
         self.config = locals()
         self.config.pop("self")
@@ -541,6 +555,8 @@ class NeuralProphet:
             newer_samples_start=newer_samples_start,
             early_stopping=False,
             pl_trainer_config=trainer_config,
+            precision=precision,
+            compile_model=compile_model,
         )
 
         # Seasonality
@@ -1216,11 +1232,15 @@ class NeuralProphet:
         # Determine the max_number of epochs
         self.config_train.set_auto_batch_epoch(n_data=len(dataset))
         # Create Train DataLoader
-        loader = DataLoader(
+        loader = time_dataset.batch_loader(
             dataset,
             batch_size=self.config_train.batch_size,
             shuffle=True,
             num_workers=num_workers,
+            # keep the worker processes alive across epochs instead of re-spawning them every epoch
+            persistent_workers=num_workers > 0,
+            # page-locked batches allow an asynchronous copy to the GPU
+            pin_memory=self.accelerator in ("auto", "gpu", "cuda") and torch.cuda.is_available(),
         )
 
         self.config_train.set_batches_per_epoch(len(loader))
@@ -1254,7 +1274,12 @@ class NeuralProphet:
                 lagged_regressor_config=self.config_lagged_regressors,
             )
             dataset_val = self._create_dataset(df_val, predict_mode=False, components_stacker=val_components_stacker)
-            loader_val = DataLoader(dataset_val, batch_size=min(1024, len(dataset_val)), shuffle=False, drop_last=False)
+            loader_val = time_dataset.batch_loader(
+                dataset_val,
+                batch_size=min(1024, len(dataset_val)),
+                shuffle=False,
+                drop_last=False,
+            )
 
         # Init the Trainer
         self.trainer, checkpoint_callback = utils_lightning.configure_trainer(
@@ -1494,7 +1519,12 @@ class NeuralProphet:
         )
         dataset = self._create_dataset(df, predict_mode=False, components_stacker=components_stacker)
         self.model.set_components_stacker(components_stacker, mode="test")
-        test_loader = DataLoader(dataset, batch_size=min(1024, len(dataset)), shuffle=False, drop_last=False)
+        test_loader = time_dataset.batch_loader(
+            dataset,
+            batch_size=min(1024, len(dataset)),
+            shuffle=False,
+            drop_last=False,
+        )
         # Use Lightning to calculate metrics
         val_metrics = self.trainer.test(self.model, dataloaders=test_loader, verbose=verbose)
         val_metrics_df = pd.DataFrame(val_metrics)
@@ -2179,7 +2209,12 @@ class NeuralProphet:
                 config_lagged_regressors=None,
             )
             self.model.set_components_stacker(feature_unstackor, mode="predict")
-            loader = DataLoader(dataset, batch_size=min(4096, len(df)), shuffle=False, drop_last=False)
+            loader = time_dataset.batch_loader(
+                dataset,
+                batch_size=min(4096, len(df)),
+                shuffle=False,
+                drop_last=False,
+            )
             predicted = {}
             for name in self.config_seasonality.periods:
                 predicted[name] = list()
@@ -2218,7 +2253,7 @@ class NeuralProphet:
         self.config_ar.n_lags = prev_n_lags
         self.config_model.max_lags = prev_max_lags
         self.config_model.n_forecasts = prev_n_forecasts
-        self.model.components_stacker["predict"] = prev_predict_components_stacker
+        self.model.set_components_stacker(prev_predict_components_stacker, mode="predict")
 
         return df
 
@@ -2354,7 +2389,7 @@ class NeuralProphet:
             )
 
         if self.config_model.max_lags > 0:
-            num_forecasts = sum(fcst["yhat1"].notna())
+            num_forecasts = np.count_nonzero(fcst["yhat1"].notna().values)
             if num_forecasts < self.config_model.n_forecasts:
                 log.warning(
                     "Too few forecasts to plot a line per forecast step." "Plotting a line per forecast origin instead."
@@ -3016,7 +3051,12 @@ class NeuralProphet:
         )
         dataset = self._create_dataset(df, predict_mode=True, components_stacker=components_stacker)
         self.model.set_components_stacker(components_stacker, mode="predict")
-        loader = DataLoader(dataset, batch_size=min(1024, len(df)), shuffle=False, drop_last=False)
+        loader = time_dataset.batch_loader(
+            dataset,
+            batch_size=min(1024, len(df)),
+            shuffle=False,
+            drop_last=False,
+        )
         if self.config_model.n_forecasts > 1:
             dates = df["ds"].iloc[self.config_model.max_lags : -self.config_model.n_forecasts + 1]
         else:
@@ -3038,16 +3078,10 @@ class NeuralProphet:
         predicted = predicted * scale_y + shift_y
 
         if include_components:
-            component_keys = component_vectors[0].keys()
-            components = {key: None for key in component_keys}
-            # Transform the components list into a dictionary
-            for batch in component_vectors:
-                for key in component_keys:
-                    components[key] = (
-                        np.concatenate([components[key], batch[key]])  # type: ignore
-                        if (components[key] is not None)
-                        else batch[key]
-                    )
+            # Transform the components list into a dictionary, concatenating the batches of each component once
+            components = {
+                key: np.concatenate([batch[key] for batch in component_vectors]) for key in component_vectors[0]
+            }
             for name, value in components.items():
                 multiplicative = False  # Flag for multiplicative components
                 if "trend" in name:
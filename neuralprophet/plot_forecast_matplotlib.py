@@ -114,7 +114,7 @@ def plot(
 
     if highlight_forecast is not None:
         if line_per_origin:
-            num_forecast_steps = sum(fcst["origin-0"].notna())
+            num_forecast_steps = np.count_nonzero(fcst["origin-0"].notna().values)
             steps_from_last = num_forecast_steps - highlight_forecast
             for i in range(len(yhat_col_names)):
                 x = ds[-(1 + i + steps_from_last)]
@@ -318,7 +318,7 @@ def plot_forecast_component(
         ax.fill_between(fcst_t, 0, y, alpha=0.2, label=label, color="#0072B2")
     else:
         artists += ax.plot(fcst_t, y, ls="-", c="#0072B2")
-        if add_x or sum(fcst[comp_name].notna()) == 1:
+        if add_x or np.count_nonzero(fcst[comp_name].notna().values) == 1:
             artists += ax.plot(fcst_t, y, "bx")
     # Specify formatting to workaround matplotlib issue #12925
     locator = AutoDateLocator(interval_multiples=False)
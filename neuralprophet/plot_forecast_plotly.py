@@ -150,7 +150,7 @@ def plot(
 
     if highlight_forecast is not None:
         if line_per_origin:
-            num_forecast_steps = sum(fcst["origin-0"].notna())
+            num_forecast_steps = np.count_nonzero(fcst["origin-0"].notna().values)
             steps_from_last = num_forecast_steps - highlight_forecast
             for i, yhat_col_name in enumerate(yhat_col_names):
                 x = [ds[-(1 + i + steps_from_last)]]
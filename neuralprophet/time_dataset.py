@@ -7,6 +7,7 @@ import numpy as np
 import pandas as pd
 import torch
 from numpy.lib.stride_tricks import sliding_window_view
+from torch.utils.data import BatchSampler, DataLoader, RandomSampler, SequentialSampler
 from torch.utils.data.dataset import Dataset
 
 from neuralprophet import configure_components, utils
@@ -98,11 +99,13 @@ class TimeDataset(Dataset):
             if col not in skip_cols:
                 self.df[col] = self.df[col].astype(float)
         # Create the tensor dictionary with the correct data types
+        # wrap the converted arrays without copying them again
         self.df_tensors = {
-            col: torch.tensor(self.df[col].values, dtype=torch.float32) for col in self.df if col not in skip_cols
+            col: torch.from_numpy(self.df[col].to_numpy(dtype=np.float32)) for col in self.df if col not in skip_cols
         }
-        self.df["ds"] = self.df["ds"].apply(lambda x: x.timestamp())  # Convert to Unix timestamp in seconds
-        self.df_tensors["ds"] = torch.tensor(self.df["ds"].values, dtype=torch.int64)
+        # Convert to Unix timestamp in seconds, for all dates at once and without modifying the dates in self.df
+        timestamps = self.df["ds"].to_numpy(dtype="datetime64[ns]").astype(np.int64) / 1e9
+        self.df_tensors["ds"] = torch.from_numpy(timestamps.astype(np.int64))
 
         self.seasonalities = None
         if self.config_seasonality is not None and hasattr(self.config_seasonality, "periods"):
@@ -177,6 +180,7 @@ class TimeDataset(Dataset):
 
     def __getitem__(self, index):
         """Overrides parent class method to get an item at index.
+        A list of indices, as yielded by a ``BatchSampler``, returns the whole batch at once, see ``get_batch``.
         Parameters
         ----------
             index : int
@@ -204,6 +208,8 @@ class TimeDataset(Dataset):
         OrderedDict
             Meta information: static information about the local dataset
         """
+        if isinstance(index, list):
+            return self.get_batch(index)
         # Convert dataset sample index to valid dataframe positional index
         # - sample index is any index up to len(dataset)
         # - dataframe positional index is given by position of first target in dataframe for given sample index
@@ -219,6 +225,29 @@ class TimeDataset(Dataset):
 
         return inputs, self.meta
 
+    def get_batch(self, indices):
+        """Gets a whole batch of items at once, instead of one ``__getitem__`` call per item and a collate.
+        Is used by the DataLoader created with ``batch_loader``.
+        Parameters
+        ----------
+            indices : list of int
+                Sample locations in dataset, starting at 0, maximum at length-1
+        Returns
+        -------
+        torch.Tensor
+            Model inputs of all samples, stacked along the first (batch) dimension
+        OrderedDict
+            Meta information, with the name of the local dataset of each sample
+        """
+        df_indices = self.sample2index_map[torch.as_tensor(indices, dtype=torch.long)]
+        if self.config_model.max_lags > 0:
+            # gather the windows of all samples at once, dims (batch, max_lags + n_forecasts, n_features)
+            window = torch.arange(-self.config_model.max_lags + 1, self.config_model.n_forecasts + 1)
+            inputs = self.all_features[df_indices.unsqueeze(1) + window]
+        else:
+            inputs = self.all_features[df_indices, :]
+        return inputs, OrderedDict({"df_name": [self.df_name] * len(df_indices)})
+
     def __len__(self):
         """Overrides Parent class method to get data length."""
         return self.length
@@ -621,6 +650,62 @@ class GlobalTimeDataset(TimeDataset):
             index : int
                 Sample location in dataset, starting at 0
         """
+        if isinstance(idx, list):
+            return self.get_batch(idx)
         df_name = self.global_sample_to_local_ID[idx]
         local_pos = self.global_sample_to_local_sample[idx]
         return self.datasets[df_name].__getitem__(local_pos)
+
+    def get_batch(self, indices):
+        """Overrides parent class method to get a whole batch of items at once.
+        Parameters
+        ----------
+            indices : list of int
+                Sample locations in dataset, starting at 0
+        """
+        indices = np.asarray(indices)
+        df_names = self.global_sample_to_local_ID[indices]
+        local_pos = self.global_sample_to_local_sample[indices]
+        inputs = None
+        # gather the samples of each local dataset at once, keeping the order of the requested indices
+        for df_name in np.unique(df_names):
+            mask = df_names == df_name
+            local_inputs, _ = self.datasets[df_name].get_batch(local_pos[mask])
+            if inputs is None:
+                inputs = local_inputs.new_empty((len(indices),) + local_inputs.shape[1:])
+            inputs[torch.from_numpy(mask)] = local_inputs
+        return inputs, OrderedDict({"df_name": df_names.tolist()})
+
+
+def batch_loader(dataset, batch_size, shuffle=False, drop_last=False, **kwargs):
+    """Creates a DataLoader that fetches each batch from the dataset at once, see ``TimeDataset.get_batch``.
+
+    A plain ``DataLoader`` over a ``TimeDataset`` works as well, but collates the batch item by item.
+
+    Parameters
+    ----------
+        dataset : TimeDataset
+            Dataset to load the batches from
+        batch_size : int
+            Number of samples per batch
+        shuffle : bool
+            Whether to reshuffle the samples every epoch
+        drop_last : bool
+            Whether to drop the last incomplete batch
+        **kwargs
+            Further arguments of the DataLoader, e.g. ``num_workers``
+
+    Returns
+    -------
+        torch.utils.data.DataLoader
+            DataLoader yielding batches of model inputs and meta information
+    """
+    sampler = RandomSampler(dataset) if shuffle else SequentialSampler(dataset)
+    # the batch sampler yields lists of indices, which the dataset resolves at once;
+    # with batch_size=None, the DataLoader does not collate the already stacked batch
+    return DataLoader(
+        dataset,
+        sampler=BatchSampler(sampler, batch_size=batch_size, drop_last=drop_last),
+        batch_size=None,
+        **kwargs,
+    )
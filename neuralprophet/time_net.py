@@ -1,9 +1,9 @@
 import logging
+import math
 from collections import OrderedDict
 from functools import reduce
 from typing import Dict, List, Optional, Union
 
-import numpy as np
 import pytorch_lightning as pl
 import torch
 import torch.nn as nn
@@ -21,11 +21,48 @@ from neuralprophet.utils import (
     reg_func_trend,
     reg_func_trend_glocal,
 )
-from neuralprophet.utils_torch import init_parameter, interprete_model
+from neuralprophet.utils_torch import forward_mlp, init_parameter, interprete_model
 
 log = logging.getLogger("NP.time_net")
 
 
+@torch.jit.script
+def _time_based_sample_weight(t: torch.Tensor, end_w: float, start_t: float) -> torch.Tensor:
+    """Computes the sample weights of the given (normalized) times, scripted so that the elementwise ops are fused."""
+    time = (t - start_t) / (1.0 - start_t)
+    time = torch.clamp(time, 0.0, 1.0)  # time = 0 to 1
+    time = math.pi * (time - 1.0)  # time =  -pi to 0
+    time = 0.5 * torch.cos(time) + 0.5  # time =  0 to 1
+    # scales end to be end weight times bigger than start weight
+    # with end weight being 1.0
+    weight = (1.0 + time * (end_w - 1.0)) / end_w
+    # add an extra dimension for the quantiles
+    return weight.unsqueeze(dim=2)
+
+
+@torch.jit.script
+def _weighted_loss(loss: torch.Tensor, weight: Optional[torch.Tensor]) -> torch.Tensor:
+    """Weighs the unreduced loss of dims (batch, n_forecasts, n_quantiles), sums it over the quantiles and averages."""
+    if weight is not None:
+        loss = loss * weight
+    return loss.sum(dim=2).mean()
+
+
+@torch.jit.script
+def _distribute_covariates(
+    all_covariates: torch.Tensor, shares: torch.Tensor, n_forecasts: int, n_quantiles: int
+) -> torch.Tensor:
+    """Distributes the combined covariate forward pass of dims (batch, n_forecasts, n_quantiles) to all covariates
+    at once, given their relative shares on the total attributions of dims (n_covariates, n_forecasts * n_quantiles).
+    Returns the contributions of dims (n_covariates, batch, n_forecasts, n_quantiles)."""
+    return all_covariates.unsqueeze(0) * shares.view(-1, 1, n_forecasts, n_quantiles)
+
+
+def _sum_components(components: List[torch.Tensor]) -> Optional[torch.Tensor]:
+    """Sums up the given components, without modifying any of them. Returns None if there are no components."""
+    return reduce(torch.add, components) if components else None
+
+
 class TimeNet(pl.LightningModule):
     """Linear time regression fun and some not so linear fun.
     A modular model that models classic time-series components
@@ -143,15 +180,35 @@ class TimeNet(pl.LightningModule):
             "test": None,
             "predict": None,
         }
+        # Indices to unstack each component from the input tensor, resolved once per components stacker
+        self._unstack_plan = {
+            "train": None,
+            "val": None,
+            "test": None,
+            "predict": None,
+        }
         # Lightning Config
         self.config_train = config_train
         self.config_normalization = config_normalization
+        # Scale and shift of the target, resolved once to denormalize it (only if normalized globally)
+        self._denormalize_params = None
+        if self.config_normalization.global_normalization:
+            if self.config_normalization.normalize == "off":
+                self._denormalize_params = (1.0, 0.0)
+            else:
+                data_params_y = self.config_normalization.global_data_params["y"]
+                self._denormalize_params = (float(data_params_y.scale), float(data_params_y.shift))
         self.include_components = False  # flag to indicate if we are in include_components mode, set in prodiction mode by set_compute_components
         self.config_model = config_model
 
         # Manual optimization: we are responsible for calling .backward(), .step(), .zero_grad().
         self.automatic_optimization = False
 
+        # process wide float32 matmul precision to restore after fitting, see on_fit_start
+        self._matmul_precision = None
+        # forward pass compiled with torch.compile, created on first use if compile_model is set
+        self._compiled_forward = None
+
         # Hyperparameters (can be tuned using trainer.tune())
         self.learning_rate = self.config_train.learning_rate
         self.batch_size = self.config_train.batch_size
@@ -168,11 +225,14 @@ class TimeNet(pl.LightningModule):
                 "batch_size": self.config_train.batch_size,
             }
             self.metrics_train = torchmetrics.MetricCollection(metrics=metrics)
-            self.metrics_val = torchmetrics.MetricCollection(metrics=metrics, postfix="_val")
+            # independent metric states for validation
+            self.metrics_val = self.metrics_train.clone(postfix="_val")
 
         # For Multiple Time Series Analysis
         self.id_list = id_list
         self.id_dict = dict((key, i) for i, key in enumerate(id_list))
+        # ID of the first time series, expanded to the batch size when no meta is provided
+        self.register_buffer("_default_meta_id", torch.zeros(1, dtype=torch.long), persistent=False)
         self.num_trends_modelled = num_trends_modelled
         self.num_seasonalities_modelled = num_seasonalities_modelled
         self.num_seasonalities_modelled_dict = num_seasonalities_modelled_dict
@@ -193,6 +253,16 @@ class TimeNet(pl.LightningModule):
 
         # Quantiles
         self.quantiles = self.config_model.quantiles
+        # the median is the first quantile, followed by the lower quantiles and then the upper quantiles
+        self._quantiles_divider_index = next(
+            (i for i, quantile in enumerate(self.quantiles) if quantile > 0.5), len(self.quantiles)
+        )
+        self._n_upper_quantiles = len(self.quantiles) - self._quantiles_divider_index
+        self._n_lower_quantiles = self._quantiles_divider_index - 1
+        # sign of each quantile diff: lower quantiles lie below the median, all other diffs are added to it
+        quantile_diff_signs = torch.ones(len(self.quantiles))
+        quantile_diff_signs[1 : self._quantiles_divider_index] = -1.0
+        self.register_buffer("_quantile_diff_signs", quantile_diff_signs, persistent=False)
 
         # Trend
         self.config_trend = config_trend
@@ -250,6 +320,27 @@ class TimeNet(pl.LightningModule):
                     "multiplicative": init_parameter(dims=[len(self.quantiles), n_multiplicative_event_params]),
                 }
             )
+            # Resolve the event_params key and parameter columns of each event once
+            self.event_params_columns = OrderedDict()
+            for event, configs in self.events_dims.items():
+                indices = configs["event_indices"]
+                if indices == list(range(indices[0], indices[-1] + 1)):
+                    columns = slice(indices[0], indices[-1] + 1)
+                else:
+                    columns = indices
+                self.event_params_columns[event] = (configs["mode"], columns)
+            # Position of the event of each event_params column among the events of its mode, dims (n_event_params)
+            n_event_params = {"additive": n_additive_event_params, "multiplicative": n_multiplicative_event_params}
+            self.events_per_mode = {"additive": [], "multiplicative": []}
+            self.event_positions = {}
+            for event, configs in self.events_dims.items():
+                self.event_positions[event] = len(self.events_per_mode[configs["mode"]])
+                self.events_per_mode[configs["mode"]].append(event)
+            for mode, events in self.events_per_mode.items():
+                event_of_column = torch.zeros(n_event_params[mode], dtype=torch.long)
+                for event_position, event in enumerate(events):
+                    event_of_column[self.events_dims[event]["event_indices"]] = event_position
+                self.register_buffer(f"_{mode}_event_of_column", event_of_column, persistent=False)
         else:
             self.config_events = None
             self.config_holidays = None
@@ -275,8 +366,11 @@ class TimeNet(pl.LightningModule):
         # Lagged regressors
         self.config_lagged_regressors = config_lagged_regressors
         if self.config_lagged_regressors is not None and self.config_lagged_regressors.regressors is not None:
+            # Names and number of lags of the covariates, in the order they are concatenated in the input
+            self._covar_names = tuple(self.config_lagged_regressors.regressors.keys())
+            self._covar_sizes = tuple(covar.n_lags for covar in self.config_lagged_regressors.regressors.values())
             covar_net_layers = []
-            d_inputs = sum([covar.n_lags for _, covar in self.config_lagged_regressors.regressors.items()])
+            d_inputs = sum(self._covar_sizes)
             for d_hidden_i in self.config_lagged_regressors.layers:
                 covar_net_layers.append(nn.Linear(d_inputs, d_hidden_i, bias=True))
                 covar_net_layers.append(nn.ReLU())
@@ -308,9 +402,8 @@ class TimeNet(pl.LightningModule):
     def ar_weights(self) -> torch.Tensor:
         """sets property auto-regression weights for regularization. Update if AR is modelled differently"""
         # TODO: this is wrong for deep networks, use utils_torch.interprete_model
-        for layer in self.ar_net:
-            if isinstance(layer, nn.Linear):
-                return layer.weight
+        # the first layer of the AR-Net is always a linear layer
+        return self.ar_net[0].weight
 
     def set_components_stacker(self, stacker, mode):
         """Set the components stacker for the given mode.
@@ -325,32 +418,30 @@ class TimeNet(pl.LightningModule):
         modes = ["train", "val", "test", "predict"]
         assert mode in modes, f"mode must be one of {modes}"
         self.components_stacker[mode] = stacker
+        self._unstack_plan[mode] = stacker.get_unstack_indices() if stacker is not None else None
+        # the gather indices of the lagged regressors are buffers, so that they move with the model to its device
+        covariates_index = (self._unstack_plan[mode] or {}).get("lagged_regressors")
+        for dim, name in ((1, "time"), (2, "feature")):
+            index = covariates_index[dim].to(self.device) if covariates_index is not None else None
+            self.register_buffer(f"_{mode}_covariates_{name}_index", index, persistent=False)
 
     def get_covar_weights(self, covar_input=None) -> torch.Tensor:
         """
         Get attributions of covariates network w.r.t. the model input.
         """
         if self.config_lagged_regressors is not None and self.config_lagged_regressors.regressors is not None:
-            # Accumulate the lags of the covariates
-            covar_splits = np.add.accumulate(
-                [covar.n_lags for _, covar in self.config_lagged_regressors.regressors.items()][:-1]
-            ).tolist()
             # If actual covariates are provided, use them to compute the attributions
-            if covar_input is not None:
-                covar_input = torch.cat([covar for _, covar in covar_input.items()], axis=1)
+            if isinstance(covar_input, dict):
+                covar_input = torch.cat([covar_input[name] for name in self._covar_names], axis=1)
             # Calculate the attributions w.r.t. the inputs
             if self.config_lagged_regressors.layers == []:
                 attributions = self.covar_net[0].weight
             else:
                 attributions = interprete_model(self, "covar_net", "forward_covar_net", covar_input)
             # Split the attributions into the different covariates
-            attributions_split = torch.tensor_split(
-                attributions,
-                covar_splits,
-                axis=1,
-            )
+            attributions_split = attributions.split(self._covar_sizes, dim=1)
             # Combine attributions and covariate name
-            covar_attributions = dict(zip(self.config_lagged_regressors.regressors.keys(), attributions_split))
+            covar_attributions = dict(zip(self._covar_names, attributions_split))
         else:
             covar_attributions = None
         return covar_attributions
@@ -361,10 +452,21 @@ class TimeNet(pl.LightningModule):
         This function is needed since the gradient information is not available during the predict_step
         method and attributions cannot be calculated in compute_components.
 
+        The relative share of each covariate on the total attributions per forecast and quantile only depends
+        on the weights, so it is computed here once instead of in every compute_components call.
+
         :param covar_weights: _description_
         :type covar_weights: torch.Tensor
         """
         self.covar_weights = covar_weights
+        self.covar_shares = None
+        if covar_weights is not None:
+            with torch.no_grad():
+                # contribution of each covariate on each forecast, dims (n_covariates, n_forecasts * n_quantiles)
+                covar_attributions = torch.stack([torch.sum(covar_weights[name], axis=1) for name in self._covar_names])
+                # Divide by the sum of the contributions of all covariates
+                covar_shares = covar_attributions / covar_attributions.sum(dim=0)
+                self.covar_shares = covar_shares
 
     def get_event_weights(self, name: str) -> Dict[str, torch.Tensor]:
         """
@@ -379,18 +481,10 @@ class TimeNet(pl.LightningModule):
                 Dict of the weights of all offsets corresponding to a particular event
         """
 
-        event_dims = self.events_dims[name]
-        mode = event_dims["mode"]
-
-        if mode == "multiplicative":
-            event_params = self.event_params["multiplicative"]
-        else:
-            assert mode == "additive"
-            event_params = self.event_params["additive"]
-
-        event_param_dict = OrderedDict({})
-        for event_delim, indices in zip(event_dims["event_delim"], event_dims["event_indices"]):
-            event_param_dict[event_delim] = event_params[:, indices : (indices + 1)]
+        mode, columns = self.event_params_columns[name]
+        # select all columns of the event at once and split them into the individual offsets
+        event_params = self.event_params[mode][:, columns].split(1, dim=1)
+        event_param_dict = OrderedDict(zip(self.events_dims[name]["event_delim"], event_params))
         return event_param_dict
 
     def _compute_quantile_forecasts_from_diffs(self, diffs: torch.Tensor, predict_mode: bool = False) -> torch.Tensor:
@@ -410,46 +504,43 @@ class TimeNet(pl.LightningModule):
 
         if len(self.quantiles) <= 1:
             return diffs
-        # generate the actual quantile forecasts from predicted differences
-        if any(quantile > 0.5 for quantile in self.quantiles):
-            quantiles_divider_index = next(i for i, quantile in enumerate(self.quantiles) if quantile > 0.5)
-        else:
-            quantiles_divider_index = len(self.quantiles)
-
-        n_upper_quantiles = diffs.shape[-1] - quantiles_divider_index
-        n_lower_quantiles = quantiles_divider_index - 1
+        if torch.is_autocast_enabled() or torch.is_autocast_cpu_enabled():
+            # keep the quantile reconstruction in full precision when training with mixed precision
+            with torch.autocast(device_type=diffs.device.type, enabled=False):
+                if diffs.dtype in (torch.float16, torch.bfloat16):
+                    diffs = diffs.float()
+                return self._reconstruct_quantiles(diffs, predict_mode)
+        return self._reconstruct_quantiles(diffs, predict_mode)
+
+    def _reconstruct_quantiles(self, diffs: torch.Tensor, predict_mode: bool) -> torch.Tensor:
+        """Reconstructs the quantile forecasts from the diffs, see ``_compute_quantile_forecasts_from_diffs``."""
+        if not predict_mode:
+            # without crossing correction, each quantile is the median plus or minus its diff
+            out = diffs * self._quantile_diff_signs
+            out[:, :, 1:] += diffs[:, :, :1].detach()
+            return out
+        # in predict mode, generate the actual quantile forecasts from predicted differences
+        quantiles_divider_index = self._quantiles_divider_index
 
         out = torch.zeros_like(diffs)
         out[:, :, 0] = diffs[:, :, 0]  # set the median where 0 is the median quantile index
 
-        if n_upper_quantiles > 0:  # check if upper quantiles exist
+        if self._n_upper_quantiles > 0:  # check if upper quantiles exist
             upper_quantile_diffs = diffs[:, :, quantiles_divider_index:]
-            if predict_mode:  # check for quantile crossing and correct them in predict mode
-                upper_quantile_diffs[:, :, 0] = torch.max(
-                    torch.tensor(0, device=self.device), upper_quantile_diffs[:, :, 0]
-                )
-                for i in range(n_upper_quantiles - 1):
-                    next_diff = upper_quantile_diffs[:, :, i + 1]
-                    diff = upper_quantile_diffs[:, :, i]
-                    upper_quantile_diffs[:, :, i + 1] = torch.max(next_diff, diff)
-            out[:, :, quantiles_divider_index:] = (
-                upper_quantile_diffs + diffs[:, :, 0].unsqueeze(dim=2).repeat(1, 1, n_upper_quantiles).detach()
-            )  # set the upper quantiles
-
-        if n_lower_quantiles > 0:  # check if lower quantiles exist
+            # check for quantile crossing and correct them:
+            # each upper quantile diff must be non-negative and at least as large as the preceding one
+            upper_quantile_diffs = torch.cummax(upper_quantile_diffs, dim=-1).values.clamp(min=0)
+            # set the upper quantiles
+            out[:, :, quantiles_divider_index:] = upper_quantile_diffs + diffs[:, :, :1].detach()
+
+        if self._n_lower_quantiles > 0:  # check if lower quantiles exist
             lower_quantile_diffs = diffs[:, :, 1:quantiles_divider_index]
-            if predict_mode:  # check for quantile crossing and correct them in predict mode
-                lower_quantile_diffs[:, :, -1] = torch.max(
-                    torch.tensor(0, device=self.device), lower_quantile_diffs[:, :, -1]
-                )
-                for i in range(n_lower_quantiles - 1, 0, -1):
-                    next_diff = lower_quantile_diffs[:, :, i - 1]
-                    diff = lower_quantile_diffs[:, :, i]
-                    lower_quantile_diffs[:, :, i - 1] = torch.max(next_diff, diff)
+            # check for quantile crossing and correct them:
+            # each lower quantile diff must be non-negative and at least as large as the following one
+            lower_quantile_diffs = torch.cummax(lower_quantile_diffs.flip(-1), dim=-1).values.flip(-1).clamp(min=0)
             lower_quantile_diffs = -lower_quantile_diffs
-            out[:, :, 1:quantiles_divider_index] = (
-                lower_quantile_diffs + diffs[:, :, 0].unsqueeze(dim=2).repeat(1, 1, n_lower_quantiles).detach()
-            )  # set the lower quantiles
+            # set the lower quantiles
+            out[:, :, 1:quantiles_divider_index] = lower_quantile_diffs + diffs[:, :, :1].detach()
 
         return out
 
@@ -473,9 +564,10 @@ class TimeNet(pl.LightningModule):
         if indices is not None:
             features = features[:, :, indices]
             params = params[:, indices]
-        # features dims: (batch, n_forecasts, n_features)  -> (batch, n_forecasts, 1, n_features)
-        # params dims: (n_quantiles, n_features) -> (batch, 1, n_quantiles, n_features)
-        out = torch.sum(features.unsqueeze(dim=2) * params.unsqueeze(dim=0).unsqueeze(dim=0), dim=-1)
+        # features dims: (batch, n_forecasts, n_features)
+        # params dims: (n_quantiles, n_features)
+        # contract over the features without materializing the expanded product
+        out = torch.einsum("bfn,qn->bfq", features, params)
         return out  # dims (batch, n_forecasts, n_quantiles)
 
     def auto_regression(self, lags: Union[torch.Tensor, float]) -> torch.Tensor:
@@ -489,7 +581,11 @@ class TimeNet(pl.LightningModule):
             torch.Tensor
                 Forecast component of dims: (batch, n_forecasts)
         """
-        x = self.ar_net(lags)
+        if self.ar_layers == []:
+            # linear AR-Net: the weights are the AR coefficients, viewed as dims (n_forecasts, n_quantiles, n_lags)
+            weight = self.ar_net[0].weight.view(self.config_model.n_forecasts, len(self.quantiles), self.n_lags)
+            return torch.einsum("bl,fql->bfq", lags, weight)
+        x = forward_mlp(lags, self.ar_net)
         # segment the last dimension to match the quantiles
         x = x.view(x.shape[0], self.config_model.n_forecasts, len(self.quantiles))
         return x
@@ -508,10 +604,10 @@ class TimeNet(pl.LightningModule):
         """
         # Concat covariates into one tensor)
         if isinstance(covariates, dict):
-            x = torch.cat([covar for _, covar in covariates.items()], axis=1)
+            x = torch.cat([covariates[name] for name in self._covar_names], axis=1)
         else:
             x = covariates
-        x = self.covar_net(x)
+        x = forward_mlp(x, self.covar_net)
         # segment the last dimension to match the quantiles
         x = x.view(x.shape[0], self.config_model.n_forecasts, len(self.quantiles))
         return x
@@ -537,125 +633,127 @@ class TimeNet(pl.LightningModule):
 
         """
 
-        time_input = self.components_stacker[mode].unstack(component_name="time", batch_tensor=input_tensor)
+        unstack_plan = self._unstack_plan[mode]
+        time_input = input_tensor[unstack_plan["time"]]
         # Handle meta argument
         if meta is None and self.meta_used_in_model:
-            name_id_dummy = self.id_list[0]
-            meta = OrderedDict()
-            meta["df_name"] = [name_id_dummy for _ in range(time_input.shape[0])]
-            meta = torch.tensor([self.id_dict[i] for i in meta["df_name"]], device=self.device)
+            meta = self._default_meta_id.expand(time_input.shape[0])
 
-        # Initialize components and nonstationary tensors
+        # Initialize components, the contributions to each (nonstationary) component sum are collected and summed once
         components = {}
-        additive_components = torch.zeros(
-            size=(time_input.shape[0], self.config_model.n_forecasts, len(self.quantiles)),
-            device=self.device,
-        )
-        additive_components_nonstationary = torch.zeros(
-            size=(time_input.shape[0], time_input.shape[1], len(self.quantiles)),
-            device=self.device,
-        )
-        multiplicative_components_nonstationary = torch.zeros(
-            size=(time_input.shape[0], time_input.shape[1], len(self.quantiles)),
-            device=self.device,
-        )
+        additive_components = []
+        additive_components_nonstationary = []
+        multiplicative_components_nonstationary = []
 
         # Unpack time feature and compute trend
         trend = self.trend(t=time_input, meta=meta)
         components["trend"] = trend
+        # trend of the lags (median only) and of the forecast window, sliced once and reused below
+        forecast_window = slice(self.n_lags, time_input.shape[1])
+        trend_lags = trend[:, : self.n_lags, 0]
+        trend_forecast = trend[:, forecast_window, :]
 
         # Unpack and process seasonalities
         seasonalities_input = None
         if self.config_seasonality and self.config_seasonality.periods:
-            seasonalities_input = self.components_stacker[mode].unstack(
-                component_name="seasonalities", batch_tensor=input_tensor
+            seasonalities_input = OrderedDict(
+                (name, input_tensor[index]) for name, index in unstack_plan["seasonalities"].items()
             )
             s = self.seasonality(s=seasonalities_input, meta=meta)
             if self.config_seasonality.mode == "additive":
-                additive_components_nonstationary += s
+                additive_components_nonstationary.append(s)
             elif self.config_seasonality.mode == "multiplicative":
-                multiplicative_components_nonstationary += s
+                multiplicative_components_nonstationary.append(s)
             components["seasonalities"] = s
 
         # Unpack and process events
         additive_events_input = None
         multiplicative_events_input = None
         if self.events_dims is not None:
-            if "additive_events" in self.components_stacker[mode].feature_indices:
-                additive_events_input = self.components_stacker[mode].unstack(
-                    component_name="additive_events", batch_tensor=input_tensor
-                )
+            if "additive_events" in unstack_plan:
+                additive_events_input = input_tensor[unstack_plan["additive_events"]]
                 additive_events = self.scalar_features_effects(additive_events_input, self.event_params["additive"])
-                additive_components_nonstationary += additive_events
+                additive_components_nonstationary.append(additive_events)
                 components["additive_events"] = additive_events
-            if "multiplicative_events" in self.components_stacker[mode].feature_indices:
-                multiplicative_events_input = self.components_stacker[mode].unstack(
-                    component_name="multiplicative_events", batch_tensor=input_tensor
-                )
+            if "multiplicative_events" in unstack_plan:
+                multiplicative_events_input = input_tensor[unstack_plan["multiplicative_events"]]
                 multiplicative_events = self.scalar_features_effects(
                     multiplicative_events_input, self.event_params["multiplicative"]
                 )
-                multiplicative_components_nonstationary += multiplicative_events
+                multiplicative_components_nonstationary.append(multiplicative_events)
                 components["multiplicative_events"] = multiplicative_events
 
         # Unpack and process regressors
         additive_regressors_input = None
         multiplicative_regressors_input = None
-        if "additive_regressors" in self.components_stacker[mode].feature_indices:
-            additive_regressors_input = self.components_stacker[mode].unstack(
-                component_name="additive_regressors", batch_tensor=input_tensor
-            )
+        if "additive_regressors" in unstack_plan:
+            additive_regressors_input = input_tensor[unstack_plan["additive_regressors"]]
             additive_regressors = self.future_regressors(additive_regressors_input, "additive")
-            additive_components_nonstationary += additive_regressors
+            additive_components_nonstationary.append(additive_regressors)
             components["additive_regressors"] = additive_regressors
-        if "multiplicative_regressors" in self.components_stacker[mode].feature_indices:
-            multiplicative_regressors_input = self.components_stacker[mode].unstack(
-                component_name="multiplicative_regressors", batch_tensor=input_tensor
-            )
+        if "multiplicative_regressors" in unstack_plan:
+            multiplicative_regressors_input = input_tensor[unstack_plan["multiplicative_regressors"]]
             multiplicative_regressors = self.future_regressors(multiplicative_regressors_input, "multiplicative")
-            multiplicative_components_nonstationary += multiplicative_regressors
+            multiplicative_components_nonstationary.append(multiplicative_regressors)
             components["multiplicative_regressors"] = multiplicative_regressors
 
+        additive_components_nonstationary = _sum_components(additive_components_nonstationary)
+        multiplicative_components_nonstationary = _sum_components(multiplicative_components_nonstationary)
+
         # Unpack and process lags
         lags_input = None
-        if "lags" in self.components_stacker[mode].feature_indices:
-            lags_input = self.components_stacker[mode].unstack(component_name="lags", batch_tensor=input_tensor)
-            nonstationary_components = (
-                trend[:, : self.n_lags, 0]
-                + additive_components_nonstationary[:, : self.n_lags, 0]
-                + trend[:, : self.n_lags, 0].detach() * multiplicative_components_nonstationary[:, : self.n_lags, 0]
-            )
-            stationarized_lags = lags_input - nonstationary_components
+        if "lags" in unstack_plan:
+            lags_input = input_tensor[unstack_plan["lags"]]
+            # subtract the nonstationary components directly from the lags, without summing them up first
+            stationarized_lags = lags_input - trend_lags
+            if additive_components_nonstationary is not None:
+                stationarized_lags = stationarized_lags - additive_components_nonstationary[:, : self.n_lags, 0]
+            if multiplicative_components_nonstationary is not None:
+                stationarized_lags = torch.addcmul(
+                    stationarized_lags,
+                    trend_lags.detach(),
+                    multiplicative_components_nonstationary[:, : self.n_lags, 0],
+                    value=-1.0,
+                )
             lags = self.auto_regression(lags=stationarized_lags)
-            additive_components += lags
+            additive_components.append(lags)
             components["lags"] = lags
 
         # Unpack and process covariates
         covariates_input = None
         if self.config_lagged_regressors and self.config_lagged_regressors.regressors is not None:
-            covariates_input = self.components_stacker[mode].unstack(
-                component_name="lagged_regressors", batch_tensor=input_tensor
+            covariates_index = (
+                slice(None),
+                getattr(self, f"_{mode}_covariates_time_index"),
+                getattr(self, f"_{mode}_covariates_feature_index"),
             )
+            # all covariates concatenated into one tensor, dims (batch, sum of covariate n_lags)
+            covariates_input = input_tensor[covariates_index]
             covariates = self.forward_covar_net(covariates=covariates_input)
-            additive_components += covariates
+            additive_components.append(covariates)
             components["covariates"] = covariates
 
         # Combine components and compute predictions
-        predictions_nonstationary = (
-            trend[:, self.n_lags : time_input.shape[1], :]
-            + additive_components_nonstationary[:, self.n_lags : time_input.shape[1], :]
-            + trend[:, self.n_lags : time_input.shape[1], :].detach()
-            * multiplicative_components_nonstationary[:, self.n_lags : time_input.shape[1], :]
-        )
-        prediction = predictions_nonstationary + additive_components
+        additive_components = _sum_components(additive_components)
+        prediction = trend_forecast
+        if additive_components_nonstationary is not None:
+            prediction = prediction + additive_components_nonstationary[:, forecast_window, :]
+        if multiplicative_components_nonstationary is not None:
+            prediction = torch.addcmul(
+                prediction,
+                trend_forecast.detach(),
+                multiplicative_components_nonstationary[:, forecast_window, :],
+            )
+        if additive_components is not None:
+            prediction = prediction + additive_components
 
         # Correct crossing quantiles
         prediction_with_quantiles = self._compute_quantile_forecasts_from_diffs(
             diffs=prediction, predict_mode=mode != "train"
         )
 
-        # Compute components if required
-        if self.include_components:
+        # Compute components if required, never while training since the training step discards them
+        if self.include_components and mode != "train":
             components = self.compute_components(
                 time_input,
                 seasonalities_input,
@@ -673,6 +771,20 @@ class TimeNet(pl.LightningModule):
 
         return prediction_with_quantiles, components
 
+    def _forward_step(self, input_tensor: torch.Tensor, mode: str, meta: Dict = None):
+        """Runs the forward pass, compiled with ``torch.compile`` if ``compile_model`` is set in the train config."""
+        if not self.config_train.compile_model:
+            return self.forward(input_tensor, mode=mode, meta=meta)
+        if self._compiled_forward is None:
+            self._compiled_forward = torch.compile(self.forward, dynamic=True)
+        return self._compiled_forward(input_tensor, mode=mode, meta=meta)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # compiled functions can not be pickled, the forward pass is compiled again when needed
+        state["_compiled_forward"] = None
+        return state
+
     def compute_components(
         self,
         time_input,
@@ -687,79 +799,101 @@ class TimeNet(pl.LightningModule):
         meta: Dict,
     ) -> Dict:
         components = {}
+        # forecast window of the components, the same for all components
+        forecast_window = slice(self.n_lags, time_input.shape[1])
 
-        components["trend"] = components_raw["trend"][:, self.n_lags : time_input.shape[1], :]
+        components["trend"] = components_raw["trend"][:, forecast_window, :]
         if self.config_trend is not None and seasonality_input is not None:
-            for name, features in seasonality_input.items():
-                components[f"season_{name}"] = self.seasonality.compute_fourier(
-                    features=features[:, self.n_lags : time_input.shape[1], :], name=name, meta=meta
-                )
+            seasonalities = self.seasonality.compute_fourier_components(
+                OrderedDict((name, features[:, forecast_window, :]) for name, features in seasonality_input.items()),
+                meta=meta,
+            )
+            for name, seasonality in seasonalities.items():
+                components[f"season_{name}"] = seasonality
         if self.n_lags > 0 and lags_input is not None:
             components["ar"] = components_raw["lags"]
         if self.config_lagged_regressors is not None and covariates_input is not None:
             # Combined forward pass
             all_covariates = components_raw["covariates"]
-            # Calculate the contribution of each covariate on each forecast
-            covar_attributions = self.covar_weights
-            # Sum the contributions of all covariates
-            covar_attribution_sum_per_forecast = reduce(
-                torch.add, [torch.sum(covar, axis=1) for _, covar in covar_attributions.items()]
-            ).to(all_covariates.device)
-            for name in covariates_input.keys():
-                # Distribute the contribution of the current covariate to the combined forward pass
-                # 1. Calculate the relative share of each covariate on the total attributions
-                # 2. Multiply the relative share with the combined forward pass
-                components[f"lagged_regressor_{name}"] = torch.multiply(
-                    all_covariates,
-                    torch.divide(
-                        torch.sum(covar_attributions[name], axis=1).to(all_covariates.device),
-                        covar_attribution_sum_per_forecast,
-                    ).reshape(self.config_model.n_forecasts, len(self.quantiles)),
-                )
+            if getattr(self, "covar_shares", None) is None:
+                # shares not yet computed, e.g. compute_components called directly or a model pickled without them
+                covar_weights = getattr(self, "covar_weights", None)
+                self.set_covar_weights(covar_weights if covar_weights is not None else self.get_covar_weights())
+            if self.covar_shares.device != all_covariates.device:
+                # the covariate weights are set outside the trainer, move their shares to the model device once
+                self.covar_shares = self.covar_shares.to(all_covariates.device)
+            # Distribute the combined forward pass to all covariates at once:
+            # multiply the relative share of each covariate on the total attributions (see set_covar_weights)
+            # with the combined forward pass
+            covariates = _distribute_covariates(
+                all_covariates, self.covar_shares, self.config_model.n_forecasts, len(self.quantiles)
+            )
+            for i, name in enumerate(self._covar_names):
+                components[f"lagged_regressor_{name}"] = covariates[i]
         if self.config_events is not None or self.config_holidays is not None:
+            # crop the event features to the forecast window once for all events
             if additive_events_input is not None:
-                components["events_additive"] = components_raw["additive_events"][
-                    :, self.n_lags : time_input.shape[1], :
-                ]
+                additive_events_input = additive_events_input[:, forecast_window, :]
+                components["events_additive"] = components_raw["additive_events"][:, forecast_window, :]
             if multiplicative_events_input is not None:
-                components["events_multiplicative"] = components_raw["multiplicative_events"][
-                    :, self.n_lags : time_input.shape[1], :
-                ]
+                multiplicative_events_input = multiplicative_events_input[:, forecast_window, :]
+                components["events_multiplicative"] = components_raw["multiplicative_events"][:, forecast_window, :]
+            # compute the effects of all events of a mode at once, dims (batch, n_forecasts, n_quantiles, n_events)
+            events_effects = {}
+            events_inputs = {"additive": additive_events_input, "multiplicative": multiplicative_events_input}
+            for mode, features in events_inputs.items():
+                if self.events_per_mode[mode]:
+                    # effect of each feature, dims (batch, n_forecasts, n_quantiles, n_features),
+                    # summed up into the event the feature belongs to
+                    features_effects = features.unsqueeze(2) * self.event_params[mode]
+                    events_effects[mode] = features_effects.new_zeros(
+                        features_effects.shape[:-1] + (len(self.events_per_mode[mode]),)
+                    ).index_add_(-1, getattr(self, f"_{mode}_event_of_column"), features_effects)
             for event, configs in self.events_dims.items():
                 mode = configs["mode"]
-                indices = configs["event_indices"]
-                if mode == "additive":
-                    features = additive_events_input[:, self.n_lags : time_input.shape[1], :]
-                    params = self.event_params["additive"]
-                else:
-                    features = multiplicative_events_input[:, self.n_lags : time_input.shape[1], :]
-                    params = self.event_params["multiplicative"]
-                components[f"event_{event}"] = self.scalar_features_effects(
-                    features=features, params=params, indices=indices
-                )
+                components[f"event_{event}"] = events_effects[mode][..., self.event_positions[event]]
         if self.config_regressors.regressors is not None:
+            # crop the regressor features to the forecast window once for all regressors
             if additive_regressors_input is not None:
-                components["future_regressors_additive"] = components_raw["additive_regressors"][
-                    :, self.n_lags : time_input.shape[1], :
-                ]
+                additive_regressors_input = additive_regressors_input[:, forecast_window, :]
+                components["future_regressors_additive"] = components_raw["additive_regressors"][:, forecast_window, :]
 
             if multiplicative_regressors_input is not None:
+                multiplicative_regressors_input = multiplicative_regressors_input[:, forecast_window, :]
                 components["future_regressors_multiplicative"] = components_raw["multiplicative_regressors"][
-                    :, self.n_lags : time_input.shape[1], :
+                    :, forecast_window, :
                 ]
 
-            for regressor, configs in self.future_regressors.regressors_dims.items():
-                mode = configs["mode"]
-                index = []
-                index.append(configs["regressor_index"])
-                if mode == "additive" and additive_regressors_input is not None:
-                    components[f"future_regressor_{regressor}"] = self.future_regressors(
-                        additive_regressors_input[:, self.n_lags : time_input.shape[1], :], mode, indeces=index
-                    )
-                if mode == "multiplicative" and multiplicative_regressors_input is not None:
-                    components[f"future_regressor_{regressor}"] = self.future_regressors(
-                        multiplicative_regressors_input[:, self.n_lags : time_input.shape[1], :], mode, indeces=index
-                    )
+            if self.config_regressors.model == "linear":
+                # compute the effects of all regressors of a mode at once, one regressor per feature
+                regressors_dims = self.future_regressors.regressors_dims
+                regressors_effects = {}
+                for mode, regressors_input in (
+                    ("additive", additive_regressors_input),
+                    ("multiplicative", multiplicative_regressors_input),
+                ):
+                    regressors = [name for name, configs in regressors_dims.items() if configs["mode"] == mode]
+                    if regressors_input is None or len(regressors) == 0:
+                        continue
+                    indices = [regressors_dims[name]["regressor_index"] for name in regressors]
+                    effects = self.future_regressors.regressors_effects(regressors_input, mode, indices)
+                    regressors_effects.update(zip(regressors, effects.unbind(dim=2)))
+                for regressor in regressors_dims:
+                    if regressor in regressors_effects:
+                        components[f"future_regressor_{regressor}"] = regressors_effects[regressor]
+            else:
+                for regressor, configs in self.future_regressors.regressors_dims.items():
+                    mode = configs["mode"]
+                    index = []
+                    index.append(configs["regressor_index"])
+                    if mode == "additive" and additive_regressors_input is not None:
+                        components[f"future_regressor_{regressor}"] = self.future_regressors(
+                            additive_regressors_input, mode, indeces=index
+                        )
+                    if mode == "multiplicative" and multiplicative_regressors_input is not None:
+                        components[f"future_regressor_{regressor}"] = self.future_regressors(
+                            multiplicative_regressors_input, mode, indeces=index
+                        )
         return components
 
     def set_compute_components(self, include_components):
@@ -773,10 +907,11 @@ class TimeNet(pl.LightningModule):
         loss = None
         # Compute loss. no reduction.
         loss = self.config_train.loss_func(predicted, targets)
+        sample_weight = None
         if self.config_train.newer_samples_weight > 1.0:
             # Weigh newer samples more.
-            loss = loss * self._get_time_based_sample_weight(t=time[:, self.n_lags :])
-        loss = loss.sum(dim=2).mean()
+            sample_weight = self._get_time_based_sample_weight(t=time[:, self.n_lags :])
+        loss = _weighted_loss(loss, sample_weight)
         # Regularize.
         if self.reg_enabled and not self.finding_lr:
             loss, reg_loss = self._add_batch_regularizations(loss, self.train_progress)
@@ -784,20 +919,28 @@ class TimeNet(pl.LightningModule):
             reg_loss = torch.tensor(0.0, device=self.device)
         return loss, reg_loss
 
+    def on_fit_start(self):
+        # Mixed 16 bit precision: allow TF32 tensor-core matmuls on supported GPUs for the remaining fp32 matmuls.
+        # The setting is process wide, so it only applies while fitting and is restored in teardown.
+        if "16" in str(self.config_train.precision):
+            self._matmul_precision = torch.get_float32_matmul_precision()
+            torch.set_float32_matmul_precision("high")
+
+    def teardown(self, stage: str):
+        if getattr(self, "_matmul_precision", None) is not None:
+            torch.set_float32_matmul_precision(self._matmul_precision)
+            self._matmul_precision = None
+
     def training_step(self, batch, batch_idx):
         inputs_tensor, meta = batch
 
         epoch_float = self.trainer.current_epoch + batch_idx / float(self.train_steps_per_epoch)
         self.train_progress = epoch_float / float(self.config_train.epochs)
-        targets = self.components_stacker["train"].unstack("targets", batch_tensor=inputs_tensor)
-        time = self.components_stacker["train"].unstack("time", batch_tensor=inputs_tensor)
-        # Global-local
-        if self.meta_used_in_model:
-            meta_name_tensor = torch.tensor([self.id_dict[i] for i in meta["df_name"]], device=self.device)
-        else:
-            meta_name_tensor = None
+        targets = inputs_tensor[self._unstack_plan["train"]["targets"]]
+        time = inputs_tensor[self._unstack_plan["train"]["time"]]
+        meta_name_tensor = self._get_meta_name_tensor(meta)
         # Run forward calculation
-        predicted, _ = self.forward(inputs_tensor, mode="train", meta=meta_name_tensor)
+        predicted, _ = self._forward_step(inputs_tensor, mode="train", meta=meta_name_tensor)
         # Store predictions in self for later network visualization
         self.train_epoch_prediction = predicted
         # Calculate loss
@@ -822,75 +965,76 @@ class TimeNet(pl.LightningModule):
 
         # Metrics
         if self.metrics_enabled and not self.finding_lr:
-            predicted_denorm = self.denormalize(predicted[:, :, 0])
-            target_denorm = self.denormalize(targets.squeeze(dim=2))
-            target_denorm = target_denorm.contiguous()
-            self.log_dict(self.metrics_train(predicted_denorm, target_denorm), **self.log_args)
+            predicted_denorm, target_denorm = self._get_metrics_inputs(predicted, targets)
+            # only accumulate metric states per step, they are computed once at the end of the epoch
+            self.metrics_train.update(predicted_denorm, target_denorm)
+            self.log_dict(self.metrics_train, **self.log_args)
             self.log("Loss", loss, **self.log_args)
             self.log("RegLoss", reg_loss, **self.log_args)
             # self.log("TrainProgress", self.train_progress, **self.log_args)
             self.log("LR", scheduler.get_last_lr()[0], **self.log_args)
         return loss
 
-    def validation_step(self, batch, batch_idx):
+    def _get_meta_name_tensor(self, meta: Dict) -> Optional[torch.Tensor]:
+        """Maps the names of the time series of the batch samples to their IDs, if the model is global-local."""
+        if not self.meta_used_in_model:
+            return None
+        meta_name_tensor = torch.as_tensor([self.id_dict[i] for i in meta["df_name"]], dtype=torch.long)
+        return meta_name_tensor.to(self.device)
+
+    def _get_metrics_inputs(self, predicted: torch.Tensor, targets: torch.Tensor):
+        """Denormalizes the median predictions and the targets of a batch for the metrics."""
+        predicted_denorm = self.denormalize(predicted[:, :, 0])
+        target_denorm = self.denormalize(targets.squeeze(dim=2))
+        # contiguous() copies only if the targets are still a strided view of the batch inputs,
+        # a tensor newly created by denormalize is already contiguous and returned as is
+        target_denorm = target_denorm.contiguous()
+        return predicted_denorm, target_denorm
+
+    def _shared_eval_step(self, batch, mode: str):
+        """Shared body of the validation and test steps, which only differ in the mode and the names of the logs."""
         inputs_tensor, meta = batch
-        targets = self.components_stacker["val"].unstack("targets", batch_tensor=inputs_tensor)
-        time = self.components_stacker["val"].unstack("time", batch_tensor=inputs_tensor)
-        # Global-local
-        if self.meta_used_in_model:
-            meta_name_tensor = torch.tensor([self.id_dict[i] for i in meta["df_name"]], device=self.device)
-        else:
-            meta_name_tensor = None
+        targets = inputs_tensor[self._unstack_plan[mode]["targets"]]
+        time = inputs_tensor[self._unstack_plan[mode]["time"]]
+        meta_name_tensor = self._get_meta_name_tensor(meta)
         # Run forward calculation
-        predicted, _ = self.forward(inputs_tensor, mode="val", meta=meta_name_tensor)
+        predicted, _ = self._forward_step(inputs_tensor, mode=mode, meta=meta_name_tensor)
         # Calculate loss
         loss, reg_loss = self.loss_func(time, predicted, targets)
         # Metrics
         if self.metrics_enabled:
-            predicted_denorm = self.denormalize(predicted[:, :, 0])
-            target_denorm = self.denormalize(targets.squeeze(dim=2))
-            target_denorm = target_denorm.contiguous()
-            self.log_dict(self.metrics_val(predicted_denorm, target_denorm), **self.log_args)
-            self.log("Loss_val", loss, **self.log_args)
-            self.log("RegLoss_val", reg_loss, **self.log_args)
+            predicted_denorm, target_denorm = self._get_metrics_inputs(predicted, targets)
+            self.metrics_val.update(predicted_denorm, target_denorm)
+            self.log_dict(self.metrics_val, **self.log_args)
+            self.log(f"Loss_{mode}", loss, **self.log_args)
+            self.log(f"RegLoss_{mode}", reg_loss, **self.log_args)
+
+    def validation_step(self, batch, batch_idx):
+        self._shared_eval_step(batch, mode="val")
 
     def test_step(self, batch, batch_idx):
-        inputs_tensor, meta = batch
-        targets = self.components_stacker["test"].unstack("targets", batch_tensor=inputs_tensor)
-        time = self.components_stacker["test"].unstack("time", batch_tensor=inputs_tensor)
-        # Global-local
-        if self.meta_used_in_model:
-            meta_name_tensor = torch.tensor([self.id_dict[i] for i in meta["df_name"]], device=self.device)
-        else:
-            meta_name_tensor = None
-        # Run forward calculation
-        predicted, _ = self.forward(inputs_tensor, mode="test", meta=meta_name_tensor)
-        # Calculate loss
-        loss, reg_loss = self.loss_func(time, predicted, targets)
-        # Metrics
-        if self.metrics_enabled:
-            predicted_denorm = self.denormalize(predicted[:, :, 0])
-            target_denorm = self.denormalize(targets.squeeze(dim=2))
-            # target_denorm = target_denorm.detach().clone()
-            target_denorm = target_denorm.contiguous()
-            self.log_dict(self.metrics_val(predicted_denorm, target_denorm), **self.log_args)
-            self.log("Loss_test", loss, **self.log_args)
-            self.log("RegLoss_test", reg_loss, **self.log_args)
+        self._shared_eval_step(batch, mode="test")
 
+    @torch.inference_mode()
     def predict_step(self, batch, batch_idx, dataloader_idx=0):
         inputs_tensor, meta = batch
-        # Global-local
-        if self.meta_used_in_model:
-            meta_name_tensor = torch.tensor([self.id_dict[i] for i in meta["df_name"]], device=self.device)
-        else:
-            meta_name_tensor = None
+        meta_name_tensor = self._get_meta_name_tensor(meta)
 
         # Run forward calculation
-        prediction, components = self.forward(
+        prediction, components = self._forward_step(
             inputs_tensor,
             mode="predict",
             meta=meta_name_tensor,
         )
+        # outputs computed under 16 bit mixed precision are returned as float32, which numpy can convert
+        half_dtypes = (torch.float16, torch.bfloat16)
+        if prediction.dtype in half_dtypes:
+            prediction = prediction.float()
+        if components is not None:
+            components = {
+                name: value.float() if isinstance(value, torch.Tensor) and value.dtype in half_dtypes else value
+                for name, value in components.items()
+            }
         return prediction, components
 
     def configure_optimizers(self):
@@ -927,18 +1071,12 @@ class TimeNet(pl.LightningModule):
         return {"optimizer": optimizer, "lr_scheduler": lr_scheduler}
 
     def _get_time_based_sample_weight(self, t):
-        end_w = self.config_train.newer_samples_weight
-        start_t = self.config_train.newer_samples_start
-        time = (t.detach() - start_t) / (1.0 - start_t)
-        time = torch.clamp(time, 0.0, 1.0)  # time = 0 to 1
-        time = np.pi * (time - 1.0)  # time =  -pi to 0
-        time = 0.5 * torch.cos(time) + 0.5  # time =  0 to 1
-        # scales end to be end weight times bigger than start weight
-        # with end weight being 1.0
-        weight = (1.0 + time * (end_w - 1.0)) / end_w
-        # add an extra dimension for the quantiles
-        weight = weight.unsqueeze(dim=2)
-        return weight
+        # the time input comes from the dataloader and is only detached in case it requires grad
+        return _time_based_sample_weight(
+            t.detach() if t.requires_grad else t,
+            end_w=float(self.config_train.newer_samples_weight),
+            start_t=float(self.config_train.newer_samples_start),
+        )
 
     def _add_batch_regularizations(self, loss, progress):
         """Add regularization terms to loss, if applicable
@@ -1021,17 +1159,8 @@ class TimeNet(pl.LightningModule):
         -------
             denormalized timeseries
         """
-        if self.config_normalization.global_normalization:
-            shift_y = (
-                self.config_normalization.global_data_params["y"].shift
-                if self.config_normalization.global_normalization and not self.config_normalization.normalize == "off"
-                else 0
-            )
-            scale_y = (
-                self.config_normalization.global_data_params["y"].scale
-                if self.config_normalization.global_normalization and not self.config_normalization.normalize == "off"
-                else 1
-            )
+        if self._denormalize_params is not None:
+            scale_y, shift_y = self._denormalize_params
             ts = scale_y * ts + shift_y
         return ts
 
@@ -1057,7 +1186,7 @@ class FlatNet(nn.Module):
 
     @property
     def ar_weights(self):
-        return self.model.layers[0].weight
+        return self.layers[0].weight
 
 
 class DeepNet(nn.Module):
@@ -1068,15 +1197,16 @@ class DeepNet(nn.Module):
     def __init__(self, d_inputs, d_outputs, layers=[]):
         # Perform initialization of the pytorch superclass
         super(DeepNet, self).__init__()
-        layers = []
+        module_list = []
         for d_hidden_i in layers:
-            layers.append(nn.Linear(d_inputs, d_hidden_i, bias=True))
-            layers.append(nn.ReLU())
+            module_list.append(nn.Linear(d_inputs, d_hidden_i, bias=True))
+            module_list.append(nn.ReLU())
             d_inputs = d_hidden_i
-        layers.append(nn.Linear(d_inputs, d_outputs, bias=True))
-        self.layers = nn.Sequential(*layers)
+        module_list.append(nn.Linear(d_inputs, d_outputs, bias=True))
+        self.layers = nn.Sequential(*module_list)
         for lay in self.layers:
-            nn.init.kaiming_normal_(lay.weight, mode="fan_in")
+            if isinstance(lay, nn.Linear):
+                nn.init.kaiming_normal_(lay.weight, mode="fan_in")
 
     def forward(self, x):
         """
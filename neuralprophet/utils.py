@@ -117,7 +117,7 @@ def reg_func_abs(weights):
         torch.Tensor
             Regularization loss
     """
-    return torch.mean(torch.abs(weights)).squeeze()
+    return utils_torch.mean_abs(weights)
 
 
 def reg_func_trend(weights, threshold=None):
@@ -139,10 +139,9 @@ def reg_func_trend(weights, threshold=None):
     # local: quantiles, num_time_series, segments + 1
     # global: quantiles, segments + 1
     # we do the average of all the sum of weights per time series and per quantile. equivalently
-    abs_weights = torch.abs(weights)
-    if threshold is not None and not math.isclose(threshold, 0):
-        abs_weights = torch.clamp(abs_weights - threshold, min=0.0)
-    reg = torch.mean(torch.sum(abs_weights, dim=-1)).squeeze()
+    if threshold is None or math.isclose(threshold, 0):
+        threshold = 0.0
+    reg = utils_torch.mean_abs_sum(weights, threshold=float(threshold))
     return reg
 
 
@@ -161,8 +160,8 @@ def reg_func_trend_glocal(trend_k0, trend_deltas, trend_local_reg):
         torch.Tensor
             regularization loss
     """
-    trend_k0_val = (trend_k0 - trend_k0.mean()).pow(2).mean()
-    trend_val = (trend_deltas - trend_deltas.mean(-2).unsqueeze(-2)).pow(2).mean()
+    trend_k0_val = utils_torch.mean_squared_deviation(trend_k0)
+    trend_val = utils_torch.mean_squared_deviation(trend_deltas, dim=-2)
 
     return trend_local_reg * (trend_k0_val + trend_val)
 
@@ -184,7 +183,7 @@ def reg_func_seasonality_glocal(season_params, seasonality_local_reg):
     # Perform the operation on each value and store the results in a list
     results = []
     for key, season_params_i in season_params.items():
-        result = (season_params_i - season_params_i.mean(-2).unsqueeze(-2)).pow(2).mean()
+        result = utils_torch.mean_squared_deviation(season_params_i, dim=-2)
         results.append(result)
 
     return seasonality_local_reg * sum(results)
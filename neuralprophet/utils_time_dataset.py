@@ -69,6 +69,76 @@ class ComponentStacker:
         assert component_name in self.unstack_func, f"Unknown component name: {component_name}"
         return self.unstack_func[component_name](batch_tensor)
 
+    def get_unstack_indices(self):
+        """
+        Resolves the indexing of each stacked component once, so that a component can be unstacked
+        with a single ``batch_tensor[index]`` lookup. Must be called after all features were stacked.
+
+        Returns:
+            dict: Index tuple per component name, equivalent to the output of the respective unstacking function.
+                Seasonalities map to an OrderedDict of index tuples per name. The lagged regressors index yields
+                all lagged regressors concatenated along dim=1, dims (batch, sum of n_lags).
+        """
+        all_ = slice(None)
+        window = slice(self.max_lags - self.n_lags, self.max_lags + self.n_forecasts)
+        indices = {}
+        for component_name in [
+            "time",
+            "additive_events",
+            "multiplicative_events",
+            "additive_regressors",
+            "multiplicative_regressors",
+        ]:
+            if component_name in self.feature_indices:
+                start_idx, end_idx = self.feature_indices[component_name]
+                if component_name == "time":
+                    features = start_idx if self.max_lags > 0 else slice(start_idx, end_idx + 1)
+                else:
+                    features = slice(start_idx, end_idx + 1)
+                if self.max_lags > 0:
+                    indices[component_name] = (all_, window, features)
+                elif component_name == "time":
+                    indices[component_name] = (all_, features)
+                else:
+                    indices[component_name] = (all_, None, features)
+        if "targets" in self.feature_indices:
+            targets_start_idx, targets_end_idx = self.feature_indices["targets"]
+            if self.max_lags > 0:
+                targets_window = slice(self.max_lags, self.max_lags + self.n_forecasts)
+                indices["targets"] = (all_, targets_window, targets_start_idx, None)
+            else:
+                indices["targets"] = (all_, None, slice(targets_start_idx, targets_end_idx + 1))
+        if "lags" in self.feature_indices:
+            lags_start_idx, _ = self.feature_indices["lags"]
+            indices["lags"] = (all_, slice(self.max_lags - self.n_lags, self.max_lags), lags_start_idx)
+        if self.lagged_regressor_config is not None and self.lagged_regressor_config.regressors is not None:
+            # gather the lags of all lagged regressors at once, yielding their concatenation along dim=1
+            time_indices = []
+            lagged_regressor_indices = []
+            for name, lagged_regressor in self.lagged_regressor_config.regressors.items():
+                lagged_regressor_key = f"lagged_regressor_{name}"
+                if lagged_regressor_key in self.feature_indices:
+                    lagged_regressor_start_idx, _ = self.feature_indices[lagged_regressor_key]
+                    lagged_regressor_offset = self.max_lags - lagged_regressor.n_lags
+                    time_indices.append(torch.arange(lagged_regressor_offset, self.max_lags))
+                    lagged_regressor_indices.append(
+                        torch.full((lagged_regressor.n_lags,), lagged_regressor_start_idx, dtype=torch.long)
+                    )
+            if time_indices:
+                indices["lagged_regressors"] = (all_, torch.cat(time_indices), torch.cat(lagged_regressor_indices))
+        indices["seasonalities"] = OrderedDict()
+        if self.config_seasonality is not None:
+            for seasonality_name in self.config_seasonality.periods.keys():
+                seasonality_key = f"seasonality_{seasonality_name}"
+                if seasonality_key in self.feature_indices:
+                    seasonality_start_idx, seasonality_end_idx = self.feature_indices[seasonality_key]
+                    features = slice(seasonality_start_idx, seasonality_end_idx)
+                    if self.max_lags > 0:
+                        indices["seasonalities"][seasonality_name] = (all_, window, features)
+                    else:
+                        indices["seasonalities"][seasonality_name] = (all_, None, features)
+        return indices
+
     def stack(self, component_name, df_tensors, feature_list, current_idx, **kwargs):
         """
         Routes the unstackion process to the appropriate function based on the component name.
@@ -1,11 +1,13 @@
 import inspect
 import logging
-from typing import Any
+import sys
+from typing import Any, Optional
 
 import numpy as np
 import pytorch_lightning as pl
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 from captum.attr import Saliency
 
 log = logging.getLogger("NP.utils_torch")
@@ -31,6 +33,71 @@ def init_parameter(dims):
         return nn.Parameter(torch.nn.init.xavier_normal_(torch.randn([1] + dims)).squeeze(0), requires_grad=True)
 
 
+def compile_supported() -> bool:
+    """
+    Check whether ``torch.compile`` can be used with the installed PyTorch on the running Python interpreter.
+
+    Returns
+    -------
+        bool
+            True if ``torch.compile`` is available, False otherwise
+    """
+    if not hasattr(torch, "compile"):
+        return False
+    # torch.compile supports Python 3.12 from PyTorch 2.4 on
+    return sys.version_info < (3, 12) or torch.__version__ >= "2.4"
+
+
+def forward_mlp(x: torch.Tensor, net: nn.Sequential) -> torch.Tensor:
+    """
+    Compute the forward pass of a ``nn.Sequential`` of ``nn.Linear`` layers with ReLU activations in between.
+
+    Calls the functional ops directly instead of dispatching through each submodule.
+
+    Parameters
+    ----------
+        x : torch.Tensor
+            Input of the first layer
+        net : nn.Sequential
+            Alternating ``nn.Linear`` and ``nn.ReLU`` layers, ending with a ``nn.Linear`` layer
+
+    Returns
+    -------
+        torch.Tensor
+            Output of the last layer
+    """
+    *hidden_layers, output_layer = (layer for layer in net if isinstance(layer, nn.Linear))
+    for layer in hidden_layers:
+        # the output of F.linear is a new tensor, so the activation can be applied in place
+        x = F.relu_(F.linear(x, layer.weight, layer.bias))
+    return F.linear(x, output_layer.weight, output_layer.bias)
+
+
+@torch.jit.script
+def mean_abs(weights: torch.Tensor) -> torch.Tensor:
+    """Mean of the absolute weights, scripted so that the elementwise op and the reduction can be fused."""
+    return torch.mean(torch.abs(weights)).squeeze()
+
+
+@torch.jit.script
+def mean_abs_sum(weights: torch.Tensor, threshold: float = 0.0) -> torch.Tensor:
+    """Mean of the sums of the absolute weights over the last dim, only the part of each weight above threshold."""
+    abs_weights = torch.abs(weights)
+    if threshold != 0.0:
+        abs_weights = torch.clamp(abs_weights - threshold, min=0.0)
+    return torch.mean(torch.sum(abs_weights, dim=-1)).squeeze()
+
+
+@torch.jit.script
+def mean_squared_deviation(weights: torch.Tensor, dim: Optional[int] = None) -> torch.Tensor:
+    """Mean squared deviation of the weights from their mean (over the given dim, or over all weights)."""
+    if dim is None:
+        weights_mean = weights.mean()
+    else:
+        weights_mean = weights.mean(dim).unsqueeze(dim)
+    return (weights - weights_mean).pow(2).mean()
+
+
 def penalize_nonzero(weights, eagerness=1.0, acceptance=1.0):
     cliff = 1.0 / (np.e * eagerness)
     return torch.log(cliff + acceptance * torch.abs(weights)) - np.log(cliff)
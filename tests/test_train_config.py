@@ -4,9 +4,13 @@ import logging
 import os
 import pathlib
 
+import numpy as np
 import pandas as pd
+import pytest
+import torch
 
 from neuralprophet import NeuralProphet
+from neuralprophet.utils_torch import compile_supported
 
 log = logging.getLogger("NP.test")
 log.setLevel("ERROR")
@@ -80,3 +84,37 @@ def test_custom_lr_scheduler():
         scheduler="OneCycleLR",
     )
     print(f"metrics = {metrics}")
+
+
+@pytest.mark.parametrize(
+    "precision, trainer_precision, param_dtype",
+    [
+        ("32-true", "32-true", torch.float32),
+        (64, "64-true", torch.float64),
+        ("bf16-mixed", "bf16-mixed", torch.float32),
+    ],
+)
+def test_precision(precision, trainer_precision, param_dtype):
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    matmul_precision = torch.get_float32_matmul_precision()
+    m = NeuralProphet(epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR, precision=precision)
+    _ = m.fit(df, freq="D")
+    # the process wide matmul precision is only changed while fitting
+    assert torch.get_float32_matmul_precision() == matmul_precision
+    assert m.config_train.precision == precision
+    assert m.trainer.precision == trainer_precision
+    # mixed precision keeps the weights in fp32, double precision converts them
+    assert next(m.model.parameters()).dtype == param_dtype
+    forecast = m.predict(df)
+    assert np.isfinite(forecast["yhat1"].to_numpy(dtype=np.float64)).all()
+
+
+@pytest.mark.skipif(not compile_supported(), reason="torch.compile is not supported on this interpreter")
+def test_compile_model():
+    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    m = NeuralProphet(epochs=1, batch_size=BATCH_SIZE, learning_rate=LR, n_lags=3, compile_model=True)
+    _ = m.fit(df, freq="D")
+    assert m.config_train.compile_model
+    forecast = m.predict(df)
+    assert m.model._compiled_forward is not None
+    assert np.isfinite(forecast["yhat1"].to_numpy(dtype=np.float64)[3:]).all()
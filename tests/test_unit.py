@@ -1,16 +1,27 @@
 #!/usr/bin/env python3
 
+import functools
 import logging
 import os
 import pathlib
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import pytest
+import torch
 from torch.utils.data import DataLoader
 
-from neuralprophet import NeuralProphet, configure, configure_components, df_utils, time_dataset, utils_time_dataset
+from neuralprophet import (
+    NeuralProphet,
+    configure,
+    configure_components,
+    df_utils,
+    set_random_seed,
+    time_dataset,
+    time_net,
+    utils_time_dataset,
+    utils_torch,
+)
 from neuralprophet.data.process import _handle_missing_data
 from neuralprophet.data.transform import _normalize
 
@@ -31,20 +42,54 @@ LR = 1.0
 PLOT = False
 
 
+@functools.lru_cache(maxsize=None)
+def _parse_csv(path):
+    return pd.read_csv(path)
+
+
+def read_csv(path, nrows=None):
+    """Returns a fresh copy of the (first nrows of the) csv file, which is parsed only once per test session."""
+    df = _parse_csv(path)
+    if nrows is not None:
+        df = df.head(nrows)
+    return df.copy()
+
+
+@functools.lru_cache(maxsize=None)
+def daily_dates(periods, start="2017-01-01"):
+    """Returns a daily DatetimeIndex, which is immutable and thus built only once per test session."""
+    return pd.date_range(start=start, periods=periods, freq="D")
+
+
+@functools.lru_cache(maxsize=None)
+def _linear_df(length):
+    return pd.DataFrame({"ds": daily_dates(length), "y": np.arange(length)})
+
+
+def linear_df(length, slope=1, df_id=None):
+    """Returns a fresh daily dataframe with a linear ``y`` starting at 2017-01-01, optionally with an ``ID`` column."""
+    df = _linear_df(length).copy()
+    if slope != 1:
+        df["y"] = df["y"] * slope
+    if df_id is not None:
+        df["ID"] = df_id
+    return df
+
+
 def test_impute_missing():
     """Debugging data preprocessing"""
     log.info("testing: Impute Missing")
     allow_missing_dates = False
-    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df = read_csv(PEYTON_FILE, nrows=NROWS)
     name = "test"
     df[name] = df["y"].values
     if not allow_missing_dates:
-        df_na, _ = df_utils.add_missing_dates_nan(df.copy(deep=True), freq="D")
+        df_na, _ = df_utils.add_missing_dates_nan(df.copy(deep=False), freq="D")
     else:
-        df_na = df.copy(deep=True)
+        df_na = df.copy(deep=False)
     to_fill = pd.isna(df_na["y"])
     # TODO fix debugging printout error
-    log.debug(f"sum(to_fill): {sum(to_fill.values)}")
+    log.debug(f"sum(to_fill): {np.count_nonzero(to_fill.values)}")
     # df_filled, remaining_na = df_utils.fill_small_linear_large_trend(
     #     df.copy(deep=True),
     #     column=name,
@@ -55,8 +100,10 @@ def test_impute_missing():
         df_filled[name], limit_linear=5, rolling=20
     )
     # TODO fix debugging printout error
-    log.debug("sum(pd.isna(df_filled[name])): {}".format(sum(pd.isna(df_filled[name]).values)))
+    log.debug("sum(pd.isna(df_filled[name])): {}".format(np.count_nonzero(df_filled[name].isna().values)))
     if PLOT:
+        import matplotlib.pyplot as plt
+
         if not allow_missing_dates:
             df, _ = df_utils.add_missing_dates_nan(df, freq="D")
         df = df.loc[200:250]
@@ -68,84 +115,84 @@ def test_impute_missing():
         plt.show()
 
 
-def test_timedataset_minimal():
+@pytest.mark.parametrize("n_forecasts, n_lags", [(1, 0), (1, 5), (3, 5)])
+def test_timedataset_minimal(n_forecasts, n_lags):
     # manually load any file that stores a time series, for example:
-    df_in = pd.read_csv(AIR_FILE, index_col=False, nrows=NROWS)
+    df_in = read_csv(AIR_FILE, nrows=NROWS)
     log.debug(f"Infile shape: {df_in.shape}")
     valid_p = 0.2
-    for n_forecasts, n_lags in [(1, 0), (1, 5), (3, 5)]:
-        config_ar = configure_components.AutoregRession(n_lags=n_lags)
-        config_model = configure.Model(n_forecasts=n_forecasts)
-        config_model.set_max_num_lags(n_lags)
-        config_missing = configure.MissingDataHandling()
-        # config_train = configure.Train()
-        df_in, _, _, _ = df_utils.check_multiple_series_id(df_in)
-        df, df_val = df_utils.split_df(df_in, n_lags, n_forecasts, valid_p)
-        # create a tabularized dataset from time series
-        # df = df.copy(deep=True)
-        # df, _, _, _ = df_utils.check_multiple_series_id(df)
-        df, _, _ = df_utils.check_dataframe(df)
-        df = _handle_missing_data(
-            df,
-            freq="MS",
-            n_lags=n_lags,
-            n_forecasts=n_forecasts,
-            config_missing=config_missing,
-            # config_regressors: Optional[configure_components.FutureRegressors],
-            # config_lagged_regressors: Optional[configure_components.LaggedRegressors],
-            # config_events: Optional[configure_components.Events],
-            # config_seasonality: Optional[configure_components.Seasonalities],
-            predicting=False,
-        )
-        local_data_params, global_data_params = df_utils.init_data_params(df=df, normalize="minmax")
-        df = df.drop("ID", axis=1)
-        df = df_utils.normalize(df, global_data_params)
-        df["ID"] = "__df__"
+    config_ar = configure_components.AutoregRession(n_lags=n_lags)
+    config_model = configure.Model(n_forecasts=n_forecasts)
+    config_model.set_max_num_lags(n_lags)
+    config_missing = configure.MissingDataHandling()
+    # config_train = configure.Train()
+    df_in, _, _, _ = df_utils.check_multiple_series_id(df_in)
+    df, df_val = df_utils.split_df(df_in, n_lags, n_forecasts, valid_p)
+    # create a tabularized dataset from time series
+    # df = df.copy(deep=True)
+    # df, _, _, _ = df_utils.check_multiple_series_id(df)
+    df, _, _ = df_utils.check_dataframe(df)
+    df = _handle_missing_data(
+        df,
+        freq="MS",
+        n_lags=n_lags,
+        n_forecasts=n_forecasts,
+        config_missing=config_missing,
+        # config_regressors: Optional[configure_components.FutureRegressors],
+        # config_lagged_regressors: Optional[configure_components.LaggedRegressors],
+        # config_events: Optional[configure_components.Events],
+        # config_seasonality: Optional[configure_components.Seasonalities],
+        predicting=False,
+    )
+    local_data_params, global_data_params = df_utils.init_data_params(df=df, normalize="minmax")
+    del df["ID"]
+    df = df_utils.normalize(df, global_data_params)
+    df["ID"] = "__df__"
 
-        components_stacker = utils_time_dataset.ComponentStacker(
-            n_lags=n_lags,
-            n_forecasts=n_forecasts,
-            max_lags=n_lags,
-            config_seasonality=None,
-            lagged_regressor_config=None,
-        )
+    components_stacker = utils_time_dataset.ComponentStacker(
+        n_lags=n_lags,
+        n_forecasts=n_forecasts,
+        max_lags=n_lags,
+        config_seasonality=None,
+        lagged_regressor_config=None,
+    )
 
-        dataset = time_dataset.TimeDataset(
-            df=df,
-            components_stacker=components_stacker,
-            predict_mode=False,
-            config_model=config_model,
-            config_missing=config_missing,
-            config_ar=config_ar,
-            config_seasonality=None,
-            config_events=None,
-            config_country_holidays=None,
-            config_regressors=None,
-            config_lagged_regressors=None,
-        )
-        input, meta = dataset.__getitem__(0)
-        # # inputs50, targets50, meta50 = dataset.__getitem__(50)
-        # log.debug(f"(n_forecasts {n_forecasts}, n_lags {n_lags})")
-        # log.debug(f"tabularized targets: {targets.shape}")
-        # log.debug(
-        #     "tabularized inputs: {}".format(
-        #         "; ".join(["{}: {}".format(inp, values.shape) for inp, values in inputs.items()])
-        #     )
-        # )
+    dataset = time_dataset.TimeDataset(
+        df=df,
+        components_stacker=components_stacker,
+        predict_mode=False,
+        config_model=config_model,
+        config_missing=config_missing,
+        config_ar=config_ar,
+        config_seasonality=None,
+        config_events=None,
+        config_country_holidays=None,
+        config_regressors=None,
+        config_lagged_regressors=None,
+    )
+    input, meta = dataset.__getitem__(0)
+    # the dates of the dataset's df are kept, only their tensor holds Unix timestamps in seconds
+    assert dataset.df["ds"].equals(df["ds"].reset_index(drop=True))
+    assert dataset.df_tensors["ds"].tolist() == [int(ds.timestamp()) for ds in df["ds"]]
+    # # inputs50, targets50, meta50 = dataset.__getitem__(50)
+    # log.debug(f"(n_forecasts {n_forecasts}, n_lags {n_lags})")
+    # log.debug(f"tabularized targets: {targets.shape}")
+    # log.debug(
+    #     "tabularized inputs: {}".format(
+    #         "; ".join(["{}: {}".format(inp, values.shape) for inp, values in inputs.items()])
+    #     )
+    # )
 
 
 def test_normalize():
     length = 100
-    days = pd.date_range(start="2017-01-01", periods=length)
-    y = np.arange(length)
-    df = pd.DataFrame({"ds": days, "y": y})
+    df = linear_df(length)
     m = NeuralProphet(
         epochs=EPOCHS,
         batch_size=BATCH_SIZE,
         learning_rate=LR,
         normalize="soft",
     )
-    df = df.copy(deep=True)
     df, _, _, _ = df_utils.check_multiple_series_id(df)
     # with config
 
@@ -157,16 +204,14 @@ def test_normalize():
     m.config_normalization.unknown_data_normalization = False
 
     # using config for utils
-    df = df.drop("ID", axis=1)
-    _ = df_utils.normalize(df.copy(deep=True), m.config_normalization.global_data_params)
-    _ = df_utils.normalize(df.copy(deep=True), m.config_normalization.local_data_params["__df__"])
+    del df["ID"]
+    _ = df_utils.normalize(df.copy(deep=False), m.config_normalization.global_data_params)
+    _ = df_utils.normalize(df.copy(deep=False), m.config_normalization.local_data_params["__df__"])
 
 
 def test_normalize_utils():
     length = 100
-    days = pd.date_range(start="2017-01-01", periods=length)
-    y = np.arange(length)
-    df = pd.DataFrame({"ds": days, "y": y})
+    df = linear_df(length)
     m = NeuralProphet(
         epochs=EPOCHS,
         batch_size=BATCH_SIZE,
@@ -189,47 +234,66 @@ def test_normalize_utils():
     )
     log.error(local_data_params)
     log.error(global_data_params)
-    df_utils.normalize(df.copy(deep=True), global_data_params)
-    df_utils.normalize(df.copy(deep=True), local_data_params["__df__"])
-
-
-def test_add_lagged_regressors():
-    NROWS = 512
-    EPOCHS = 3
+    df_utils.normalize(df.copy(deep=False), global_data_params)
+    df_utils.normalize(df.copy(deep=False), local_data_params["__df__"])
+
+
+def test_normalize_dtypes():
+    # float columns keep their dtype, nullable columns keep their missing values
+    df = pd.DataFrame(
+        {
+            "ds": daily_dates(4),
+            "y": np.array([1.0, 2.0, 3.0, 4.0], dtype=np.float32),
+            "A": pd.array([1, None, 3, 5], dtype="Int64"),
+            "B": np.array([0.0, 2.0, 4.0, 8.0]),
+        }
+    )
+    data_params = {
+        "ds": df_utils.ShiftScale(shift=df["ds"].min(), scale=df["ds"].max() - df["ds"].min()),
+        "y": df_utils.ShiftScale(shift=1.0, scale=3.0),
+        "A": df_utils.ShiftScale(shift=1.0, scale=4.0),
+        "B": df_utils.ShiftScale(shift=0.0, scale=8.0),
+    }
+    df_norm = df_utils.normalize(df.copy(), data_params)
+    assert df_norm["y_scaled"].dtype == np.float32
+    assert df_norm["B"].dtype == np.float64
+    assert df_norm["A"].isna().tolist() == [False, True, False, False]
+    assert np.allclose(df_norm["y_scaled"], [0.0, 1 / 3, 2 / 3, 1.0])
+    assert np.allclose(df_norm["A"].dropna().to_numpy(dtype=np.float64), [0.0, 0.5, 1.0])
+    assert np.allclose(df_norm["B"], [0.0, 0.25, 0.5, 1.0])
+    assert np.allclose(df_norm["t"], [0.0, 1 / 3, 2 / 3, 1.0])
+
+
+@pytest.mark.parametrize("value", ["A", ["B"], ["A", "B", "C"]])
+def test_add_lagged_regressors(value):
     BATCH_SIZE = 32
-    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df = read_csv(PEYTON_FILE, nrows=NROWS)
     df["A"] = df["y"].rolling(7, min_periods=1).mean()
     df["B"] = df["y"].rolling(15, min_periods=1).mean()
     df["C"] = df["y"].rolling(30, min_periods=1).mean()
-    col_dict = {
-        "1": "A",
-        "2": ["B"],
-        "3": ["A", "B", "C"],
-    }
-    for key, value in col_dict.items():
-        log.debug(value)
-        if isinstance(value, list):
-            feats = np.array(["ds", "y"] + value)
-        else:
-            feats = np.array(["ds", "y", value])
-        df1 = pd.DataFrame(df, columns=feats)
-        cols = [col for col in df1.columns if col not in ["ds", "y"]]
-        m = NeuralProphet(
-            n_forecasts=1,
-            n_lags=3,
-            weekly_seasonality=False,
-            daily_seasonality=False,
-            epochs=EPOCHS,
-            batch_size=BATCH_SIZE,
-            learning_rate=LR,
-        )
-        m = m.add_lagged_regressor(names=cols)
-        m.fit(df1, freq="D", validation_df=df1[-100:])
-        future = m.make_future_dataframe(df1, n_historic_predictions=365)
-        # Check if the future dataframe contains all the lagged regressors
-        check = any(item in future.columns for item in cols)
-        m.predict(future)
-        log.debug(check)
+    log.debug(value)
+    if isinstance(value, list):
+        feats = np.array(["ds", "y"] + value)
+    else:
+        feats = np.array(["ds", "y", value])
+    df1 = pd.DataFrame(df, columns=feats)
+    cols = [col for col in df1.columns if col not in ["ds", "y"]]
+    m = NeuralProphet(
+        n_forecasts=1,
+        n_lags=3,
+        weekly_seasonality=False,
+        daily_seasonality=False,
+        epochs=EPOCHS,
+        batch_size=BATCH_SIZE,
+        learning_rate=LR,
+    )
+    m = m.add_lagged_regressor(names=cols)
+    m.fit(df1, freq="D", validation_df=df1[-100:])
+    future = m.make_future_dataframe(df1, n_historic_predictions=365)
+    # Check if the future dataframe contains all the lagged regressors
+    check = any(item in future.columns for item in cols)
+    m.predict(future)
+    log.debug(check)
 
 
 def test_auto_batch_epoch():
@@ -261,14 +325,19 @@ def test_auto_batch_epoch():
 
 
 def test_split_impute():
+    # split_df does not modify the model, so one model per configuration is shared between the checks
+    models = {}
+
     def check_split(df_in, df_len_expected, n_lags, n_forecasts, freq, p=0.1):
-        m = NeuralProphet(
-            epochs=EPOCHS,
-            batch_size=BATCH_SIZE,
-            learning_rate=LR,
-            n_lags=n_lags,
-            n_forecasts=n_forecasts,
-        )
+        if (n_lags, n_forecasts) not in models:
+            models[(n_lags, n_forecasts)] = NeuralProphet(
+                epochs=EPOCHS,
+                batch_size=BATCH_SIZE,
+                learning_rate=LR,
+                n_lags=n_lags,
+                n_forecasts=n_forecasts,
+            )
+        m = models[(n_lags, n_forecasts)]
         df_in, _, _, _ = df_utils.check_multiple_series_id(df_in)
         df_in, _, _ = df_utils.check_dataframe(df_in, check_y=False)
         df_in = _handle_missing_data(
@@ -295,23 +364,23 @@ def test_split_impute():
         assert n_test == n_test_expected
 
     log.info("testing: SPLIT: daily data")
-    df = pd.read_csv(PEYTON_FILE)
+    df = read_csv(PEYTON_FILE)
     check_split(df_in=df, df_len_expected=len(df) + 59, freq="D", n_lags=10, n_forecasts=3)
     log.info("testing: SPLIT: monthly data")
-    df = pd.read_csv(AIR_FILE, nrows=NROWS)
+    df = read_csv(AIR_FILE, nrows=NROWS)
     check_split(df_in=df, df_len_expected=len(df), freq="MS", n_lags=10, n_forecasts=3)
     log.info("testing: SPLIT:  5min data")
-    df = pd.read_csv(YOS_FILE, nrows=NROWS)
+    df = read_csv(YOS_FILE, nrows=NROWS)
     check_split(df_in=df, df_len_expected=len(df), freq="5min", n_lags=10, n_forecasts=3)
     # redo with no lags
     log.info("testing: SPLIT: daily data")
-    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df = read_csv(PEYTON_FILE, nrows=NROWS)
     check_split(df_in=df, df_len_expected=len(df), freq="D", n_lags=0, n_forecasts=1)
     log.info("testing: SPLIT: monthly data")
-    df = pd.read_csv(AIR_FILE, nrows=NROWS)
+    df = read_csv(AIR_FILE, nrows=NROWS)
     check_split(df_in=df, df_len_expected=len(df), freq="MS", n_lags=0, n_forecasts=1)
     log.info("testing: SPLIT:  5min data")
-    df = pd.read_csv(YOS_FILE)
+    df = read_csv(YOS_FILE)
     check_split(df_in=df, df_len_expected=len(df) - 12, freq="5min", n_lags=0, n_forecasts=1)
 
 
@@ -321,25 +390,20 @@ def test_cv():
         folds = df_utils.crossvalidation_split_df(
             df, n_lags, n_forecasts, valid_fold_num, valid_fold_pct, fold_overlap_pct
         )
-        train_folds_len = []
-        val_folds_len = []
-        for f_train, f_val in folds:
-            train_folds_len.append(len(f_train))
-            val_folds_len.append(len(f_val))
-        train_folds_samples = [x - n_lags - n_forecasts + 1 for x in train_folds_len]
-        val_folds_samples = [x - n_lags - n_forecasts + 1 for x in val_folds_len]
+        train_folds_len = np.array([len(f_train) for f_train, _ in folds])
+        val_folds_len = np.array([len(f_val) for _, f_val in folds])
+        train_folds_samples = train_folds_len - (n_lags + n_forecasts - 1)
+        val_folds_samples = val_folds_len - (n_lags + n_forecasts - 1)
         total_samples = len(df) - n_lags - (2 * n_forecasts) + 2
         val_fold_each = max(1, int(total_samples * valid_fold_pct))
         overlap_each = int(fold_overlap_pct * val_fold_each)
-        assert all([x == val_fold_each for x in val_folds_samples])
-        train_folds_should = [
-            total_samples - val_fold_each - (valid_fold_num - i - 1) * (val_fold_each - overlap_each)
-            for i in range(valid_fold_num)
-        ]
-        assert all([x == y for (x, y) in zip(train_folds_samples, train_folds_should)])
+        assert np.all(val_folds_samples == val_fold_each)
+        remaining_folds = valid_fold_num - 1 - np.arange(valid_fold_num)
+        train_folds_should = total_samples - val_fold_each - remaining_folds * (val_fold_each - overlap_each)
+        assert np.array_equal(train_folds_samples, train_folds_should)
 
     len_df = 100
-    df = pd.DataFrame({"ds": pd.date_range(start="2017-01-01", periods=len_df), "y": np.arange(len_df)})
+    df = linear_df(len_df)
     check_folds(
         df=df,
         n_lags=0,
@@ -349,7 +413,7 @@ def test_cv():
         fold_overlap_pct=0.0,
     )
     len_df = 1000
-    df = pd.DataFrame({"ds": pd.date_range(start="2017-01-01", periods=len_df), "y": np.arange(len_df)})
+    df = linear_df(len_df)
     check_folds(
         df=df,
         n_lags=50,
@@ -375,12 +439,12 @@ def test_cv_for_global_model():
             fold_overlap_pct,
             global_model_cv_type=global_model_cv_type,
         )
+        # count the samples of all IDs in each fold once
+        train_folds_sizes = [f_train.groupby("ID", sort=False).size() for f_train, _ in folds]
+        val_folds_sizes = [f_val.groupby("ID", sort=False).size() for _, f_val in folds]
         for df_name, df_i in df.groupby("ID"):
-            train_folds_len = []
-            val_folds_len = []
-            for f_train, f_val in folds:
-                train_folds_len.append(len(f_train[f_train["ID"] == df_name]))
-                val_folds_len.append(len(f_val[f_val["ID"] == df_name]))
+            train_folds_len = np.array([sizes.get(df_name, 0) for sizes in train_folds_sizes])
+            val_folds_len = np.array([sizes.get(df_name, 0) for sizes in val_folds_sizes])
             if global_model_cv_type == "local":
                 total_samples = len(df_i) - n_lags - (2 * n_forecasts) + 2
             elif global_model_cv_type == "intersect":
@@ -390,30 +454,27 @@ def test_cv_for_global_model():
                 raise ValueError(
                     "Insert valid value for global_model_cv_type (None or global-type does not work for this function"
                 )
-            train_folds_samples = [x - n_lags - n_forecasts + 1 for x in train_folds_len]
-            val_folds_samples = [x - n_lags - n_forecasts + 1 for x in val_folds_len]
+            train_folds_samples = train_folds_len - (n_lags + n_forecasts - 1)
+            val_folds_samples = val_folds_len - (n_lags + n_forecasts - 1)
             val_fold_each = max(1, int(total_samples * valid_fold_pct))
             overlap_each = int(fold_overlap_pct * val_fold_each)
-            assert all([x == val_fold_each for x in val_folds_samples])
-            train_folds_should = [
-                total_samples - val_fold_each - (valid_fold_num - i - 1) * (val_fold_each - overlap_each)
-                for i in range(valid_fold_num)
-            ]
-            assert all([x == y for (x, y) in zip(train_folds_samples, train_folds_should)])
+            assert np.all(val_folds_samples == val_fold_each)
+            remaining_folds = valid_fold_num - 1 - np.arange(valid_fold_num)
+            train_folds_should = total_samples - val_fold_each - remaining_folds * (val_fold_each - overlap_each)
+            assert np.array_equal(train_folds_samples, train_folds_should)
         return folds
 
     # Test cv for dict with time series with similar time range
     len_df = 1000
-    df1 = pd.DataFrame(
-        {"ds": pd.date_range(start="2017-01-01", periods=len_df), "y": np.arange(len_df) * 3, "ID": "df1"}
-    )
-    df2 = pd.DataFrame(
-        {"ds": pd.date_range(start="2017-01-01", periods=len_df), "y": np.arange(len_df) * 5, "ID": "df2"}
-    )
-    df3 = pd.DataFrame(
-        {"ds": pd.date_range(start="2017-01-01", periods=len_df), "y": np.arange(len_df) * 2, "ID": "df3"}
+    df1 = linear_df(len_df, slope=3, df_id="df1")
+    # build the global dataframe of the three series with the same time range at once, instead of concatenating
+    df_global = pd.DataFrame(
+        {
+            "ds": np.tile(df1["ds"].values, 3),
+            "y": np.concatenate([np.arange(len_df) * slope for slope in (3, 5, 2)]),
+            "ID": np.repeat(["df1", "df2", "df3"], len_df).astype(object),
+        }
     )
-    df_global = pd.concat((df1, df2, df3))
     n_lags = 3
     n_forecasts = 2
     k = 4
@@ -431,7 +492,7 @@ def test_cv_for_global_model():
             # manually asserting global-time case:
             for i in range(k):
                 for j in range(2):
-                    aux = fold_type[cv_type][i][j].copy(deep=True)
+                    aux = fold_type[cv_type][i][j]
                     assert len(aux[aux["ID"] == "df1"]) == len(single_fold[i][j])
         else:
             fold_type[cv_type] = check_folds_dict(
@@ -450,9 +511,7 @@ def test_cv_for_global_model():
     df1 = pd.DataFrame(
         {"ds": pd.date_range(start="2017-03-01", periods=len_df), "y": np.arange(len_df) * 3, "ID": "df1"}
     )
-    df2 = pd.DataFrame(
-        {"ds": pd.date_range(start="2017-01-01", periods=len_df), "y": np.arange(len_df) * 5, "ID": "df2"}
-    )
+    df2 = linear_df(len_df, slope=5, df_id="df2")
     df3 = pd.DataFrame(
         {"ds": pd.date_range(start="2017-02-01", periods=len_df), "y": np.arange(len_df) * 2, "ID": "df3"}
     )
@@ -473,7 +532,7 @@ def test_cv_for_global_model():
             for i in range(k):
                 for j in range(2):
                     for key in fold_type[cv_type][i][j]["ID"].unique():
-                        aux = fold_type[cv_type][i][j].copy(deep=True)
+                        aux = fold_type[cv_type][i][j]
                         assert len(aux[aux["ID"] == key]) == list_for_global_time_assertion[cont]
                         cont = cont + 1
         else:
@@ -500,7 +559,7 @@ def test_cv_for_global_model():
 
 
 def test_reg_delay():
-    df = pd.read_csv(PEYTON_FILE, nrows=102)[:100]
+    df = read_csv(PEYTON_FILE, nrows=102)[:100]
     m = NeuralProphet(
         epochs=10,
         batch_size=BATCH_SIZE,
@@ -526,7 +585,7 @@ def test_reg_delay():
 
 def test_double_crossvalidation():
     len_df = 100
-    df = pd.DataFrame({"ds": pd.date_range(start="2017-01-01", periods=len_df), "y": np.arange(len_df), "ID": "__df__"})
+    df = linear_df(len_df, df_id="__df__")
     folds_val, folds_test = df_utils.double_crossvalidation_split_df(
         df=df,
         n_lags=0,
@@ -557,7 +616,7 @@ def test_double_crossvalidation():
         n_lags=2,
     )
     len_df = 100
-    df = pd.DataFrame({"ds": pd.date_range(start="2017-01-01", periods=len_df), "y": np.arange(len_df), "ID": "__df__"})
+    df = linear_df(len_df, df_id="__df__")
     folds_val, folds_test = m.double_crossvalidation_split_df(
         df=df,
         k=3,
@@ -582,12 +641,10 @@ def test_double_crossvalidation():
     # Raise not implemented error as double_crossvalidation is not compatible with many time series
     with pytest.raises(NotImplementedError):
         len_df = 100
-        df = pd.DataFrame(
-            {"ds": pd.date_range(start="2017-01-01", periods=len_df), "y": np.arange(len_df), "ID": "__df__"}
-        )
-        df1 = df.copy(deep=True)
+        df = linear_df(len_df, df_id="__df__")
+        df1 = df.copy(deep=False)
         df1["ID"] = "df1"
-        df2 = df.copy(deep=True)
+        df2 = df.copy(deep=False)
         df2["ID"] = "df2"
         folds_val, folds_test = m.double_crossvalidation_split_df(
             pd.concat((df1, df2)),
@@ -600,7 +657,7 @@ def test_double_crossvalidation():
 def test_check_duplicate_ds():
     # Check whether a ValueError is thrown in case there
     # are duplicate dates in the ds column of dataframe
-    df = pd.read_csv(PEYTON_FILE, nrows=102)[:50]
+    df = read_csv(PEYTON_FILE, nrows=102)[:50]
     # introduce duplicates in dataframe
     df = pd.concat([df, df[8:9]]).reset_index()
     # Check if error thrown on duplicates
@@ -615,25 +672,31 @@ def test_check_duplicate_ds():
         m.fit(df, freq="D")
 
 
+# freq is set automatically (also if set to None), when equal to the original and when different than the ideal
+@pytest.mark.parametrize("freq, expected_freq", [("auto", "D"), (None, "D"), ("D", "D"), ("5D", "5D")])
+def test_infer_frequency_split(freq, expected_freq):
+    df = read_csv(PEYTON_FILE, nrows=50)
+    m = NeuralProphet(
+        epochs=EPOCHS,
+        batch_size=BATCH_SIZE,
+        learning_rate=LR,
+    )
+    assert df_utils.infer_frequency(df, n_lags=0, freq=freq) == expected_freq
+    df_train, df_test = m.split_df(df, freq=freq)
+    log.debug(f"freq is set for freq={freq}")
+    assert len(df_train) > 0 and len(df_test) > 0
+    # without lags, the validation samples follow the training samples and make up the smaller part
+    assert df_train["ds"].max() < df_test["ds"].min()
+    assert len(df_test) < len(df_train)
+
+
 def test_infer_frequency():
-    df = pd.read_csv(PEYTON_FILE, nrows=102)[:50]
+    df = read_csv(PEYTON_FILE, nrows=50)
     m = NeuralProphet(
         epochs=EPOCHS,
         batch_size=BATCH_SIZE,
         learning_rate=LR,
     )
-    # Check if freq is set automatically
-    df_train, df_test = m.split_df(df)
-    log.debug("freq automatically set")
-    # Check if freq is set automatically
-    df_train, df_test = m.split_df(df, freq=None)
-    log.debug("freq automatically set even if set to None")
-    # Check if freq is set when equal to the original
-    df_train, df_test = m.split_df(df, freq="D")
-    log.debug("freq is equal to ideal")
-    # Check if freq is set in different freq
-    df_train, df_test = m.split_df(df, freq="5D")
-    log.debug("freq is set even though is different than the ideal")
     # Assert for data unevenly spaced
     index = np.unique(np.geomspace(1, 40, 20, dtype=int))
     df_uneven = df.iloc[index, :]
@@ -643,9 +706,9 @@ def test_infer_frequency():
     df_train, df_test = m.split_df(df_uneven, freq="H")
     log.debug("freq is set even with not definable freq")
     # Check if freq is set for list
-    df1 = df.copy(deep=True)
+    df1 = df.copy(deep=False)
     df1["ID"] = "df1"
-    df2 = df.copy(deep=True)
+    df2 = df.copy(deep=False)
     df2["ID"] = "df2"
     df_global = pd.concat((df1, df2))
     m = NeuralProphet(
@@ -680,7 +743,7 @@ def test_infer_frequency():
     frequencies = ["M", "MS", "Y", "YS", "Q", "QS", "B", "BH"]
     df = df.iloc[:200, :]
     for freq in frequencies:
-        df1 = df.copy(deep=True)
+        df1 = df.copy(deep=False)
         time_range = pd.date_range(start="1994-12-01", periods=df.shape[0], freq=freq)
         df1["ds"] = time_range
         df_train, df_test = m.split_df(df1)
@@ -688,7 +751,9 @@ def test_infer_frequency():
 
 
 def test_globaltimedataset():
-    df = pd.read_csv(PEYTON_FILE, nrows=100)
+    df = read_csv(PEYTON_FILE, nrows=100)
+    # parse the dates once, before splitting the series
+    df["ds"] = pd.to_datetime(df["ds"])
     df1 = df[:50]
     df1 = df1.assign(ID="df1")
     df2 = df[50:]
@@ -714,15 +779,15 @@ def test_globaltimedataset():
         learning_rate=LR,
     )
     # TODO m3.add_country_holidays("US")
+    df_global = pd.concat((df1, df2), ignore_index=True)
+    # the models have no regressors or events, so they share the same normalization of the same data
     config_normalization = configure.Normalization("auto", False, True, False)
+    config_normalization.init_data_params(
+        df_global, m1.config_lagged_regressors, m1.config_regressors, m1.config_events
+    )
+    df_global = _normalize(df=df_global, config_normalization=config_normalization)
     for m in [m1, m2, m3]:
-        df_global = pd.concat((df1, df2))
-        df_global["ds"] = pd.to_datetime(df_global.loc[:, "ds"])
-        config_normalization.init_data_params(
-            df_global, m.config_lagged_regressors, m.config_regressors, m.config_events
-        )
         m.config_normalization = config_normalization
-        df_global = _normalize(df=df_global, config_normalization=m.config_normalization)
         components_stacker = utils_time_dataset.ComponentStacker(
             n_lags=m.config_ar.n_lags,
             n_forecasts=m.config_model.n_forecasts,
@@ -738,7 +803,6 @@ def test_globaltimedataset():
     df4["A"] = np.arange(len(df4))
     df4["B"] = np.arange(len(df4)) * 0.1
     df4["ID"] = "df4"
-    df4["ds"] = pd.to_datetime(df4.loc[:, "ds"])
     m4 = NeuralProphet(
         epochs=EPOCHS,
         batch_size=BATCH_SIZE,
@@ -749,7 +813,6 @@ def test_globaltimedataset():
     m4.add_lagged_regressor("B")
     config_normalization = configure.Normalization("auto", False, True, False)
     for m in [m4]:
-        df4
         config_normalization.init_data_params(df4, m.config_lagged_regressors, m.config_regressors, m.config_events)
         m.config_normalization = config_normalization
         df4 = _normalize(df=df4, config_normalization=m.config_normalization)
@@ -765,7 +828,9 @@ def test_globaltimedataset():
 
 
 def test_dataloader():
-    df = pd.read_csv(PEYTON_FILE, nrows=100)
+    df = read_csv(PEYTON_FILE, nrows=100)
+    # parse the dates once, before splitting the series
+    df["ds"] = pd.to_datetime(df["ds"])
     df["A"] = np.arange(len(df))
     df["B"] = np.arange(len(df)) * 0.1
     df1 = df[:50]
@@ -785,8 +850,7 @@ def test_dataloader():
     m.add_future_regressor("A")
     m.add_lagged_regressor("B")
     config_normalization = configure.Normalization("auto", False, True, False)
-    df_global = pd.concat((df1, df2))
-    df_global["ds"] = pd.to_datetime(df_global.loc[:, "ds"])
+    df_global = pd.concat((df1, df2), ignore_index=True)
     config_normalization.init_data_params(df_global, m.config_lagged_regressors, m.config_regressors, m.config_events)
     m.config_normalization = config_normalization
     df_global = _normalize(df=df_global, config_normalization=m.config_normalization)
@@ -798,21 +862,104 @@ def test_dataloader():
         lagged_regressor_config=None,
     )
     dataset = m._create_dataset(df_global, predict_mode=False, components_stacker=components_stacker)
-    loader = DataLoader(dataset, batch_size=min(1024, len(df)), shuffle=True, drop_last=False)
+    loader = time_dataset.batch_loader(dataset, batch_size=min(1024, len(df)), shuffle=True, drop_last=False)
+    df_names = set(df_global["ID"].unique())
     for _, meta in loader:
-        assert set(meta["df_name"]) == set(df_global["ID"].unique())
-        break
+        assert set(meta["df_name"]) == df_names
+    # a batch gathered at once equals the stacked items
+    indices = [5, 0, len(dataset) - 1, 20]
+    inputs, meta = dataset[indices]
+    items = [dataset[i] for i in indices]
+    assert inputs.equal(torch.stack([item[0] for item in items]))
+    assert meta["df_name"] == [item[1]["df_name"] for item in items]
+    # a plain DataLoader with the default collate yields the same batches
+    plain_loader = DataLoader(dataset, batch_size=BATCH_SIZE, shuffle=False)
+    for (plain_inputs, plain_meta), (inputs, meta) in zip(
+        plain_loader, time_dataset.batch_loader(dataset, batch_size=BATCH_SIZE)
+    ):
+        assert plain_inputs.equal(inputs)
+        assert plain_meta["df_name"] == meta["df_name"]
+
+
+def test_unstack_indices():
+    df = read_csv(PEYTON_FILE, nrows=100)
+    df["A"] = np.arange(len(df))
+    df["B"] = np.arange(len(df)) * 0.1
+    df["ID"] = "df1"
+    df["ds"] = pd.to_datetime(df.loc[:, "ds"])
+    for n_lags, n_forecasts in [(0, 1), (3, 2)]:
+        m = NeuralProphet(
+            epochs=EPOCHS,
+            batch_size=BATCH_SIZE,
+            learning_rate=LR,
+            yearly_seasonality=True,
+            weekly_seasonality=True,
+            daily_seasonality=True,
+            n_lags=n_lags,
+            n_forecasts=n_forecasts,
+        )
+        m.add_future_regressor("A")
+        if n_lags > 0:
+            m.add_lagged_regressor("B")
+            df_case = df
+        else:
+            # lagged regressors need lags, so B is not registered and must not be in the data
+            df_case = df.drop(columns="B")
+        config_normalization = configure.Normalization("auto", False, True, False)
+        config_normalization.init_data_params(df_case, m.config_lagged_regressors, m.config_regressors, m.config_events)
+        m.config_normalization = config_normalization
+        df_norm = _normalize(df=df_case, config_normalization=m.config_normalization)
+        components_stacker = utils_time_dataset.ComponentStacker(
+            n_lags=m.config_ar.n_lags,
+            n_forecasts=m.config_model.n_forecasts,
+            max_lags=m.config_model.max_lags,
+            config_seasonality=m.config_seasonality,
+            lagged_regressor_config=m.config_lagged_regressors,
+        )
+        dataset = m._create_dataset(df_norm, predict_mode=False, components_stacker=components_stacker)
+        inputs, _ = next(iter(time_dataset.batch_loader(dataset, batch_size=BATCH_SIZE)))
+        unstack_indices = components_stacker.get_unstack_indices()
+        for component_name in ["time", "targets", "lags", "additive_regressors"]:
+            if component_name in unstack_indices:
+                expected = components_stacker.unstack(component_name, batch_tensor=inputs)
+                assert inputs[unstack_indices[component_name]].equal(expected)
+        expected = components_stacker.unstack("seasonalities", batch_tensor=inputs)
+        assert list(unstack_indices["seasonalities"].keys()) == list(expected.keys())
+        for name, index in unstack_indices["seasonalities"].items():
+            assert inputs[index].equal(expected[name])
+        if n_lags > 0:
+            expected = components_stacker.unstack("lagged_regressors", batch_tensor=inputs)
+            assert inputs[unstack_indices["lagged_regressors"]].equal(torch.cat(list(expected.values()), dim=1))
+
+
+def test_forward_mlp():
+    net = torch.nn.Sequential(
+        torch.nn.Linear(5, 8), torch.nn.ReLU(), torch.nn.Linear(8, 4), torch.nn.ReLU(), torch.nn.Linear(4, 6)
+    )
+    x = torch.randn(10, 5)
+    assert torch.allclose(utils_torch.forward_mlp(x, net), net(x))
+    linear = torch.nn.Sequential(torch.nn.Linear(5, 6, bias=False))
+    assert torch.allclose(utils_torch.forward_mlp(x, linear), linear(x))
+
+
+def test_deep_net_layers():
+    for layers in [[], [8], [8, 4]]:
+        net = time_net.DeepNet(d_inputs=5, d_outputs=3, layers=layers)
+        assert len([lay for lay in net.layers if isinstance(lay, torch.nn.Linear)]) == len(layers) + 1
+        assert net(torch.randn(10, 5)).shape == (10, 3)
 
 
 def test_newer_sample_weight():
-    dates = pd.date_range(start="2020-01-01", periods=100, freq="D")
-    a = [0, 1] * 50
-    y = -1 * np.array(a[:50])
-    y = np.concatenate([y, np.array(a[50:])])
+    dates = daily_dates(100, start="2020-01-01")
+    a = np.tile(np.array([0, 1], dtype=np.float32), 50)
+    y = a.copy()
     # first half: y = -a
     # second half: y = a
+    y[:50] *= -1
     df = pd.DataFrame({"ds": dates, "y": y, "a": a})
 
+    # fixed seed for a reproducible fit
+    set_random_seed(0)
     newer_bias = 5
     m = NeuralProphet(
         epochs=10,
@@ -832,14 +979,13 @@ def test_newer_sample_weight():
 
     # test that second half dominates
     # -> positive relationship of a and y
-    dates = pd.date_range(start="2020-01-01", periods=100, freq="D")
     a = [1] * 100
     y = [0] * 100
     df = pd.DataFrame({"ds": dates, "y": y, "a": a})
     forecast1 = m.predict(df[:10])
     forecast2 = m.predict(df[-10:])
-    avg_a1 = np.mean(forecast1["future_regressor_a"])
-    avg_a2 = np.mean(forecast2["future_regressor_a"])
+    avg_a1 = forecast1["future_regressor_a"].to_numpy().mean()
+    avg_a2 = forecast2["future_regressor_a"].to_numpy().mean()
     log.info(f"avg regressor a contribution first samples: {avg_a1}")
     log.info(f"avg regressor a contribution last samples: {avg_a2}")
     # must hold
@@ -847,8 +993,8 @@ def test_newer_sample_weight():
     assert avg_a2 > 0.1
 
     # this is less strict, as it also depends on trend, but should still hold
-    avg_y1 = np.mean(forecast1["yhat1"])
-    avg_y2 = np.mean(forecast2["yhat1"])
+    avg_y1 = forecast1["yhat1"].to_numpy().mean()
+    avg_y2 = forecast2["yhat1"].to_numpy().mean()
     log.info(f"avg yhat first samples: {avg_y1}")
     log.info(f"avg yhat last samples: {avg_y2}")
     assert avg_y1 > -0.9
@@ -856,8 +1002,10 @@ def test_newer_sample_weight():
 
 
 def test_make_future():
-    df = pd.read_csv(PEYTON_FILE, nrows=100)
-    df["A"] = df["y"].rolling(7, min_periods=1).mean()
+    # compute the rolling regressor once for both model configurations
+    df_base = read_csv(PEYTON_FILE, nrows=100)
+    df_base["A"] = df_base["y"].rolling(7, min_periods=1).mean()
+    df = df_base.copy()
     df_future_regressor = pd.DataFrame({"A": np.arange(10)})
 
     # without lags
@@ -875,8 +1023,7 @@ def test_make_future():
     )
     assert len(future) == 10
 
-    df = pd.read_csv(PEYTON_FILE, nrows=100)
-    df["A"] = df["y"].rolling(7, min_periods=1).mean()
+    df = df_base.copy()
     df["B"] = df["y"].rolling(30, min_periods=1).min()
     df_future_regressor = pd.DataFrame({"A": np.arange(10)})
     # with lags
@@ -897,7 +1044,8 @@ def test_make_future():
     assert len(future) == 10 + 5 + 3
 
 
-def test_too_many_NaN():
+@pytest.mark.parametrize("nan_window", [slice(25, 50), slice(60, 80)])
+def test_too_many_NaN(nan_window):
     n_lags = 12
     n_forecasts = 1
     config_ar = configure_components.AutoregRession(n_lags=n_lags)
@@ -910,10 +1058,10 @@ def test_too_many_NaN():
         drop_missing=False,
     )
     length = 100
-    days = pd.date_range(start="2017-01-01", periods=length)
+    days = daily_dates(length)
     y = np.ones(length)
     # introduce large NaN value window
-    y[25:50] = np.nan
+    y[nan_window] = np.nan
     df = pd.DataFrame({"ds": days, "y": y})
     # linear imputation and rolling avg to fill some of the missing data (but not all are filled!)
     df.loc[:, "y"], remaining_na = df_utils.fill_linear_then_rolling_avg(
@@ -924,18 +1072,17 @@ def test_too_many_NaN():
     df, _, _, id_list = df_utils.check_multiple_series_id(df)
     df, _, _ = df_utils.check_dataframe(df)
     local_data_params, global_data_params = df_utils.init_data_params(df=df, normalize="minmax")
-    df = df.drop("ID", axis=1)
+    # normalize skips the ID column and scales all other columns in one array operation
     df = df_utils.normalize(df, global_data_params)
-    df["ID"] = "__df__"
+    components_stacker = utils_time_dataset.ComponentStacker(
+        n_lags=n_lags,
+        n_forecasts=n_forecasts,
+        max_lags=config_model.max_lags,
+        config_seasonality=None,
+        lagged_regressor_config=None,
+    )
     # Check if ValueError is thrown, if NaN values remain after auto-imputing
     with pytest.raises(ValueError):
-        components_stacker = utils_time_dataset.ComponentStacker(
-            n_lags=n_lags,
-            n_forecasts=n_forecasts,
-            max_lags=config_model.max_lags,
-            config_seasonality=None,
-            lagged_regressor_config=None,
-        )
         time_dataset.TimeDataset(
             df=df,
             components_stacker=components_stacker,
@@ -956,11 +1103,11 @@ def test_future_df_with_nan():
     # if there are more consecutive NaN values at the end of df than n_lags: ValueError.
     m = NeuralProphet(epochs=EPOCHS, batch_size=BATCH_SIZE, learning_rate=LR, n_lags=12, n_forecasts=10)
     length = 100
-    y = np.random.randint(0, 100, size=length)
-    days = pd.date_range(start="2017-01-01", periods=length)
-    df = pd.DataFrame({"ds": days, "y": y})
+    y = np.random.default_rng(0).integers(0, 100, size=length, dtype=np.int32).astype(np.float32)
+    days = daily_dates(length)
     # introduce 15 NaN values at the end of df. Now #NaN at end > n_lags
-    df.iloc[-15:, 1] = np.nan
+    y[-15:] = np.nan
+    df = pd.DataFrame({"ds": days, "y": y})
     m.fit(df, freq="D")
     with pytest.raises(ValueError):
         m.make_future_dataframe(df, periods=10, n_historic_predictions=5)
@@ -994,17 +1141,18 @@ def test_ffill_in_future_df():
         n_forecasts=10,
     )
     length = 100
-    y = np.random.randint(0, 100, size=length)
-    days = pd.date_range(start="2017-01-01", periods=length)
-    df = pd.DataFrame({"ds": days, "y": y})
+    y = np.random.default_rng(0).integers(0, 100, size=length, dtype=np.int32).astype(np.float32)
+    days = daily_dates(length)
     # introduce some NaN values at the end of df, before expanding it to the future
-    df.iloc[-5:, 1] = np.nan
+    y[-5:] = np.nan
+    df = pd.DataFrame({"ds": days, "y": y})
     m.fit(df, freq="D")
     m.make_future_dataframe(df, periods=10, n_historic_predictions=5)
 
 
-def test_handle_negative_values_remove():
-    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+@pytest.mark.parametrize("handle", ["remove", "error", 0.0])
+def test_handle_negative_values(handle):
+    df = read_csv(PEYTON_FILE, nrows=NROWS)
     # Insert a negative value
     df.loc[0, "y"] = -1
     m = NeuralProphet(
@@ -1015,45 +1163,20 @@ def test_handle_negative_values_remove():
         impute_missing=False,
         drop_missing=False,
     )
-    df_ = m.handle_negative_values(df, handle="remove")
-    assert len(df_) == len(df) - 1
-
-
-def test_handle_negative_values_error():
-    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
-    # Insert a negative value
-    df.loc[0, "y"] = -1
-    m = NeuralProphet(
-        epochs=EPOCHS,
-        batch_size=BATCH_SIZE,
-        learning_rate=LR,
-        n_lags=3,
-        impute_missing=False,
-        drop_missing=False,
-    )
-    with pytest.raises(ValueError):
-        m.handle_negative_values(df, handle="error")
-
-
-def test_handle_negative_values_replace():
-    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
-    # Insert a negative value
-    df.loc[0, "y"] = -1
-    m = NeuralProphet(
-        epochs=EPOCHS,
-        batch_size=BATCH_SIZE,
-        learning_rate=LR,
-        n_lags=3,
-        impute_missing=False,
-        drop_missing=False,
-    )
-    df_ = m.handle_negative_values(df, handle=0.0)
-    assert df_.loc[0, "y"] == 0.0
+    if handle == "error":
+        with pytest.raises(ValueError):
+            m.handle_negative_values(df, handle=handle)
+    elif handle == "remove":
+        df_ = m.handle_negative_values(df, handle=handle)
+        assert len(df_) == len(df) - 1
+    else:
+        df_ = m.handle_negative_values(df, handle=handle)
+        assert df_.loc[0, "y"] == handle
 
 
 def test_float32_inputs():
     # test if float32 inputs are forecasted as float32 outputs
-    df = pd.read_csv(PEYTON_FILE, nrows=NROWS)
+    df = read_csv(PEYTON_FILE, nrows=NROWS)
     df["y"] = df["y"].astype(np.float32)
     m = NeuralProphet(
         epochs=EPOCHS,
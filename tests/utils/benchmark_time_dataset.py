@@ -6,9 +6,8 @@ from itertools import product
 
 import pandas as pd
 import torch.utils.benchmark as benchmark
-from torch.utils.data import DataLoader
 
-from neuralprophet import NeuralProphet, df_utils, utils, utils_time_dataset
+from neuralprophet import NeuralProphet, df_utils, time_dataset, utils, utils_time_dataset
 from neuralprophet.data.process import _check_dataframe, _handle_missing_data
 from neuralprophet.data.transform import _normalize
 
@@ -116,7 +115,7 @@ def load(nrows=NROWS, epochs=EPOCHS, batch=BATCH_SIZE, season=True, iterations=1
     # Determine the max_number of epochs
     m.config_train.set_auto_batch_epoch(n_data=len(dataset))
 
-    loader = DataLoader(
+    loader = time_dataset.batch_loader(
         dataset,
         batch_size=m.config_train.batch_size,
         shuffle=True,